@@ -0,0 +1,128 @@
+"""Post-test analysis of a run's force curve.
+
+    python analysis.py runs/run_20240101_120000.bin [...]
+
+Works on whole runs at once with NumPy/SciPy array operations, so a run log
+of millions of samples is analysed in milliseconds straight from its
+memmap. Only the PROCESSING part of the run is used. Temperature and mode
+records repeat the last force, like a sample-and-hold, which leaves the peak
+and the area unchanged.
+"""
+import math
+import sys
+from typing import NamedTuple
+
+import numpy as np
+from scipy.integrate import trapezoid
+from scipy.ndimage import uniform_filter1d
+
+from break_detector import BREAK_DROP
+from run_log import read_run_log, MODE_CODES
+
+SMOOTH_SAMPLES = 5              # moving-average width used for break detection
+SLOPE_RANGE = (0.1, 0.5)        # slope is fitted where the rising force is between these fractions of the peak
+
+
+class RunAnalysis(NamedTuple):
+    samples: int
+    duration: float             # s
+    peak_force: float           # g
+    peak_time: float            # s from the first PROCESSING sample
+    break_time: float           # s, nan when no break was detected
+    break_force: float          # g, nan when no break was detected
+    area: float                 # g*s under the curve up to the break (or the end)
+    slope: float                # g/s over SLOPE_RANGE of the rising curve, nan if too few samples
+    required_force: float       # g, the recipe's PeakForce, nan if unknown
+    passed: bool
+
+
+def processing_samples(records):
+    """(time in s from the first sample, force) for the PROCESSING records of a run log."""
+    mask = records['mode'] == MODE_CODES["PROCESSING"]
+    first = int(np.argmax(mask)) if len(mask) else 0
+    if not len(mask) or not mask[first]:
+        return np.empty(0), np.empty(0)
+    last = len(mask) - int(np.argmax(mask[::-1]))
+    if mask[first:last].all():
+        # One uninterrupted pull, the usual case: slice instead of copying through the mask
+        t_ns, force = records['t_ns'][first:last], records['force'][first:last]
+    else:
+        t_ns, force = records['t_ns'][mask], records['force'][mask]
+    time_s = np.subtract(t_ns, t_ns[0], dtype=np.float64)
+    time_s *= 1e-9
+    return time_s, np.asarray(force, dtype=np.float64)
+
+
+def analyze(time_s, force, required_force=math.nan, break_drop=BREAK_DROP, smooth=SMOOTH_SAMPLES):
+    time_s = np.asarray(time_s, dtype=np.float64)
+    force = np.asarray(force, dtype=np.float64)
+    n = len(force)
+    if n == 0:
+        return RunAnalysis(0, 0.0, 0.0, math.nan, math.nan, math.nan, 0.0, math.nan,
+                           required_force, False)
+
+    peak = int(np.argmax(force))
+    peak_force = float(force[peak])
+
+    # Break: first point after the peak where the smoothed force has fallen far enough
+    smoothed = uniform_filter1d(force[peak:], size=min(smooth, n - peak), mode='nearest')
+    below = np.flatnonzero(smoothed <= peak_force * (1.0 - break_drop))
+    end = peak + int(below[0]) if len(below) else n - 1
+    if len(below):
+        break_time, break_force = float(time_s[end]), float(force[end])
+    else:
+        break_time = break_force = math.nan
+
+    area = float(trapezoid(force[:end + 1], time_s[:end + 1])) if end else 0.0
+
+    rising = force[:peak + 1]
+    low, high = SLOPE_RANGE
+    i0 = int(np.argmax(rising >= peak_force * low))
+    i1 = int(np.argmax(rising >= peak_force * high))
+    slope = _fit_slope(time_s[i0:i1 + 1], force[i0:i1 + 1]) if i1 > i0 else math.nan
+
+    passed = not math.isnan(required_force) and peak_force >= required_force
+    return RunAnalysis(n, float(time_s[-1] - time_s[0]), peak_force, float(time_s[peak]),
+                       break_time, break_force, area, slope, required_force, passed)
+
+
+def _fit_slope(x, y):
+    # Closed-form least-squares slope, a few passes instead of polyfit's lstsq
+    dx = x - x.mean()
+    var = np.dot(dx, dx)
+    return float(np.dot(dx, y) / var) if var > 0 else math.nan
+
+
+def analyze_run_log(path, **options):
+    header, records = read_run_log(path)
+    try:
+        required_force = float(header['process_config'][4])
+    except (KeyError, IndexError, ValueError):
+        required_force = math.nan
+    time_s, force = processing_samples(records)
+    return analyze(time_s, force, required_force, **options)
+
+
+def format_analysis(result):
+    verdict = "PASS" if result.passed else "FAIL"
+    if math.isnan(result.break_time):
+        broke = "no break"
+    else:
+        broke = f"break at {result.break_time:.3f} s ({result.break_force:g} g)"
+    return (f"{verdict}: peak {result.peak_force:g} g at {result.peak_time:.3f} s "
+            f"(required {result.required_force:g} g), {broke}, area {result.area:.1f} g*s, "
+            f"slope {result.slope:.4g} g/s, {result.samples} samples over {result.duration:.2f} s")
+
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print(__doc__)
+        return 2
+    for path in paths:
+        print(f"{path}: {format_analysis(analyze_run_log(path))}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""End-to-end acquisition benchmark: serial bytes -> SerialWorker -> rx_data -> labels/plot.
+
+Runs the real MainWindow under the Qt offscreen platform. The input is a
+paced in-memory port (a ReplayPort), fed by a synthetic tensile stream or a
+capture made with CTTM_CAPTURE=1 (serial_capture.py); --rate 0 replays it
+as fast as the decoding and rendering stages keep up. The report covers
+sustained frames/s, arrival-to-display latency p50/p99 and process CPU per
+1000 frames.
+
+benchmarks/baselines/acquisition.json holds the result at the default
+settings for the current release. Run --compare against it before a
+release; it exits 1 when a metric regressed by more than --tolerance.
+After an intended change in performance, save a new baseline with --save
+and commit it together with the change. Compare on the machine the
+baseline was recorded on (python and platform are stored in the file).
+
+    python benchmarks/bench_acquisition.py --rate 5000 --frames 50000
+    python benchmarks/bench_acquisition.py --file captures/capture_20260101_120000.cap --rate 0
+    python benchmarks/bench_acquisition.py --save benchmarks/baselines/acquisition.json
+    python benchmarks/bench_acquisition.py --compare benchmarks/baselines/acquisition.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import QTimer
+
+from protocol import RX_READY, RX_START, RX_PAUSE
+from serial_capture import ReplayPort, read_capture
+from simulator import ForceCurve
+
+_FRAME_RE = re.compile(rb'[^#]*#')
+DRAIN_TIMEOUT = 5.0             # seconds to wait for the GUI after the last byte
+PORT_TICK = 0.001               # bytes become readable in 1 ms bursts, like a USB-serial driver
+
+
+def synthetic_stream(frames, temperature_every=100):
+    curve = ForceCurve(duration=frames)
+    parts = [RX_READY.encode(), RX_START.encode()]
+    for i in range(frames):
+        if i % temperature_every == 0:
+            parts.append(b'*TEP:037#')
+        parts.append(b'*FRC:%06d#' % curve(i))
+    parts.append(RX_PAUSE.encode())
+    return b''.join(parts)
+
+
+class PacedStreamPort(ReplayPort):
+    """ReplayPort that releases a byte stream at a fixed frame rate.
+
+    Frames are grouped into PORT_TICK chunks, the bursts a USB-serial driver
+    delivers. The clock starts on the first write (TX_START from
+    start_process). The port notes when each *FRC: frame becomes readable,
+    which is the arrival time the latency figures are measured from.
+    """
+
+    def __init__(self, stream, rate, timeout=0.05):
+        chunks = []
+        force_ends = []
+        end = 0
+        for i, frame in enumerate(_FRAME_RE.findall(stream)):
+            end += len(frame)
+            if frame.startswith(b'*FRC:'):
+                force_ends.append(end)
+            # Frame i is due once (i + 1) / rate seconds have passed, rounded up to a tick
+            t_ns = int(math.ceil((i + 1) / rate / PORT_TICK) * PORT_TICK * 1e9) if rate > 0 else 0
+            if chunks and chunks[-1][0] == t_ns:
+                chunks[-1][1].append(frame)
+            else:
+                chunks.append((t_ns, [frame]))
+        super().__init__([(t_ns, b''.join(frames)) for t_ns, frames in chunks], speed=1.0 if rate > 0 else 0,
+                         timeout=timeout, start_on_write=True)
+        self.rate = rate
+        self.force_ends = force_ends
+        self.arrival_ns = [0] * len(force_ends)
+        self._forces_arrived = 0
+
+    def read(self, size=1):
+        chunk = super().read(size)
+        if chunk:
+            now = time.perf_counter_ns()
+            force_ends = self.force_ends
+            i = self._forces_arrived
+            while i < len(force_ends) and force_ends[i] <= self.cursor:
+                self.arrival_ns[i] = now
+                i += 1
+            self._forces_arrived = i
+        return chunk
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_benchmark(stream, rate):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    import cttm_v110
+    window = cttm_v110.MainWindow()
+    # Keep run logs out of the tree and the camera closed
+    workdir = tempfile.mkdtemp(prefix='cttm_bench_')
+    os.chdir(workdir)
+    window.start_camera = lambda: None
+
+    port = PacedStreamPort(stream, rate)
+    latencies = []
+    shown = [0]
+    refresh_labels = window.refresh_labels
+
+    def measured_refresh_labels():
+        refresh_labels()
+        now = time.perf_counter_ns()
+        total = window.force_data.total
+        arrival = port.arrival_ns
+        latencies.extend(now - arrival[i] for i in range(shown[0], min(total, len(arrival))))
+        shown[0] = total
+
+    window.refresh_labels = measured_refresh_labels
+    window.scheduler.stop("labels")
+    window.scheduler.add("labels", measured_refresh_labels, cttm_v110.LABEL_FPS, start=True)
+
+    window.process_config = ['bench', '5', '120', '37', '56']
+    window.handle_screen_change(5)
+    window.ser = port
+    window.start_serial_worker()
+    window.start_process()
+
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+    wall_start = time.perf_counter()
+    drained_at = [None]
+
+    def check_done():
+        if not port.exhausted:
+            return
+        if drained_at[0] is None:
+            drained_at[0] = time.perf_counter()
+        caught_up = shown[0] >= len(port.force_ends)
+        if caught_up or time.perf_counter() - drained_at[0] > DRAIN_TIMEOUT:
+            app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(check_done)
+    poll.start(20)
+    app.exec_()
+    wall = time.perf_counter() - wall_start
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+    window.stop_serial_worker()
+    window.port_watcher.stop()
+    window.finish_run()
+    os.chdir(cwd)
+
+    cpu = (usage_end.ru_utime - usage_start.ru_utime) + (usage_end.ru_stime - usage_start.ru_stime)
+    sent = len(port.force_ends)
+    received = window.force_data.total
+    latencies.sort()
+    return {
+        'rate': rate,
+        'force_frames_sent': sent,
+        'force_frames_received': received,
+        'force_frames_dropped': sent - received,
+        'frames_per_second': received / wall if wall else 0.0,
+        'latency_p50_ms': percentile(latencies, 0.50) / 1e6,
+        'latency_p99_ms': percentile(latencies, 0.99) / 1e6,
+        'cpu_ms_per_1000_frames': cpu * 1000 / received * 1000 if received else float('nan'),
+        'wall_s': wall,
+        'plot_full_draws': window.live_plot.full_draws if window.live_plot else 0,
+        'plot_blits': window.live_plot.blits if window.live_plot else 0,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+# metric -> True when a higher value is better
+COMPARED = {
+    'frames_per_second': True,
+    'latency_p50_ms': False,
+    'latency_p99_ms': False,
+    'cpu_ms_per_1000_frames': False,
+    'force_frames_dropped': False,
+}
+
+
+def compare(result, baseline, tolerance):
+    regressions = []
+    for key, higher_is_better in COMPARED.items():
+        new, old = result[key], baseline.get(key)
+        if old is None:
+            continue
+        change = (new - old) / old if old else (0.0 if new == old else float('inf'))
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        print(f"  {key:<24} {old:12.3f} -> {new:12.3f}  ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file', help='capture or raw byte file to replay instead of a synthetic stream')
+    parser.add_argument('--frames', type=int, default=20000, help='synthetic force frames')
+    parser.add_argument('--rate', type=float, default=2000, help='frames/s released by the port, 0 = as fast as possible')
+    parser.add_argument('--save', help='write the result as a baseline JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed relative regression')
+    args = parser.parse_args()
+
+    if args.file:
+        _, chunks = read_capture(args.file)
+        stream = b''.join(chunk for _, chunk in chunks)
+    else:
+        stream = synthetic_stream(args.frames)
+
+    result = run_benchmark(stream, args.rate)
+    print(f"rate {args.rate:g} frames/s: {result['force_frames_received']}/{result['force_frames_sent']} "
+          f"force frames, {result['frames_per_second']:,.0f} frames/s sustained")
+    print(f"  latency p50 {result['latency_p50_ms']:.2f} ms, p99 {result['latency_p99_ms']:.2f} ms")
+    print(f"  CPU {result['cpu_ms_per_1000_frames']:.2f} ms per 1000 frames")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared to {args.compare} ({baseline.get('date', '?')}):")
+        if compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark for analysis.analyze_run_log on a large run log.
+
+Usage:
+    python benchmarks/bench_analysis.py                       # synthetic 5M-sample run
+    python benchmarks/bench_analysis.py --file runs/run_x.bin # an existing run log
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from analysis import analyze_run_log, format_analysis
+from run_log import RunLogger, RECORD_DTYPE, MODE_CODES
+
+# Shape of simulator.ForceCurve as (fraction of the pull, fraction of the peak)
+CURVE = ([0.0, 0.05, 0.6, 0.8, 0.82, 1.0], [0.0, 0.02, 0.8, 1.0, 0.05, 0.01])
+
+
+def synthetic_run_log(path, samples, rate=2000, peak_force=56.0, seed=0):
+    logger = RunLogger(path, ['bench', '5', '120', '37', str(peak_force)], "PROCESSING")
+    logger.close()
+    rng = np.random.default_rng(seed)
+    records = np.empty(samples, dtype=RECORD_DTYPE)
+    x = np.linspace(0.0, 1.0, samples)
+    records['t_ns'] = np.arange(samples, dtype=np.int64) * (10 ** 9 // rate)
+    records['force'] = np.round(peak_force * (np.interp(x, *CURVE) + rng.normal(0, 0.002, samples)), 2)
+    records['temperature'] = 37
+    records['mode'] = MODE_CODES["PROCESSING"]
+    with open(path, 'ab') as f:
+        f.write(records.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file', help='run log to analyse instead of a synthetic one')
+    parser.add_argument('--samples', type=int, default=5_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix='cttm_bench_'), 'run.bin')
+        synthetic_run_log(path, args.samples)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = analyze_run_log(path)
+        timings.append(time.perf_counter() - start)
+    print(format_analysis(result))
+    best = min(timings)
+    print(f"analyze_run_log: best {best * 1e3:.1f} ms, median {sorted(timings)[len(timings) // 2] * 1e3:.1f} ms "
+          f"({result.samples / best / 1e6:.1f} M samples/s)")
+
+
+if __name__ == '__main__':
+    main()
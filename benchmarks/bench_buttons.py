@@ -0,0 +1,81 @@
+"""Button-press-to-repaint latency on the manual operation screen.
+
+Runs the real MainWindow under the Qt offscreen platform without a serial
+port or camera. For every toggle button it times a synthetic mouse click
+through the handler up to a synchronous repaint of the button, and it
+times re-entering screen 6.
+
+    python benchmarks/bench_buttons.py --iterations 200
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+
+BUTTONS = {
+    'button_13': 'motor left',
+    'button_14': 'motor right',
+    'button_15': 'heater',
+    'button_16': 'clamp 1',
+    'button_17': 'clamp 2',
+    'button_18': 'reset',
+}
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def timed(action, repaint, iterations, app):
+    timings = []
+    # Handlers print on every press; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            start = time.perf_counter()
+            action()
+            repaint()
+            timings.append((time.perf_counter() - start) * 1000)
+            app.processEvents()
+    timings.sort()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    os.chdir(ROOT)
+    import cttm_v110
+    window = cttm_v110.MainWindow()
+    window.start_camera = lambda: None
+    window.show()
+    window.init_screen_6()
+    app.processEvents()
+
+    print(f"{'action':<16} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, label in BUTTONS.items():
+        button = getattr(window, name)
+        timings = timed(lambda: QTest.mouseClick(button, Qt.LeftButton), button.repaint, args.iterations, app)
+        print(f"{label:<16} {percentile(timings, 0.5):8.3f} {percentile(timings, 0.99):8.3f} {timings[-1]:8.3f}")
+    timings = timed(window.init_screen_6, window.repaint, max(args.iterations // 10, 1), app)
+    print(f"{'enter screen 6':<16} {percentile(timings, 0.5):8.3f} {percentile(timings, 0.99):8.3f} {timings[-1]:8.3f}")
+    window.stop_serial_worker()
+    window.port_watcher.stop()
+    window.scheduler.stop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Screen-switch time of MainWindow.handle_screen_change.
+
+Runs the real MainWindow under the Qt offscreen platform without a serial
+port or camera. It walks the screens in the order an operator does and
+times each switch up to a synchronous repaint of the window.
+
+    python benchmarks/bench_navigation.py --rounds 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets
+
+# login -> menu -> create -> menu -> load -> auto -> manual -> menu
+ROUTE = [1, 2, 3, 2, 4, 5, 6, 2]
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    os.chdir(ROOT)
+    import cttm_v110
+    window = cttm_v110.MainWindow()
+    window.start_camera = lambda: None
+    window.show()
+    app.processEvents()
+
+    timings = {screen: [] for screen in ROUTE}
+    first = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(args.rounds):
+            for screen in ROUTE:
+                start = time.perf_counter()
+                window.handle_screen_change(screen)
+                window.repaint()
+                elapsed = (time.perf_counter() - start) * 1000
+                if screen in first:
+                    timings[screen].append(elapsed)
+                else:
+                    first[screen] = elapsed
+                app.processEvents()
+
+    print(f"{'screen':<8} {'first ms':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for screen in sorted(timings):
+        values = sorted(timings[screen])
+        print(f"{screen:<8} {first[screen]:9.2f} {percentile(values, 0.5):8.2f} {percentile(values, 0.99):8.2f}")
+    window.port_watcher.stop()
+    window.scheduler.stop_all()
+
+
+if __name__ == '__main__':
+    main()
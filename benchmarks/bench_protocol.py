@@ -0,0 +1,103 @@
+"""Micro-benchmark for protocol.FrameDecoder.
+
+Usage:
+    python benchmarks/bench_protocol.py                      # synthetic stream
+    python benchmarks/bench_protocol.py --file capture.bin   # captured byte stream
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from protocol import FrameDecoder, RX_START, RX_PAUSE, RX_RESET, RX_READY
+
+
+def synthetic_stream(frames, seed=0):
+    rng = random.Random(seed)
+    parts = [RX_READY.encode(), RX_START.encode()]
+    for i in range(frames):
+        if i % 10 == 0:
+            parts.append(b'*TEP:%03d#' % rng.randint(20, 40))
+        else:
+            parts.append(b'*FRC:%06d#' % rng.randint(0, 999999))
+        if i % 5000 == 4999:
+            parts.append(b'\x00noise*FR')    # line noise and a truncated frame
+    parts += [RX_PAUSE.encode(), RX_RESET.encode(), RX_READY.encode()]
+    return b''.join(parts)
+
+
+def split_chunks(stream, max_chunk, seed=0):
+    rng = random.Random(seed)
+    chunks = []
+    pos = 0
+    while pos < len(stream):
+        size = rng.randint(1, max_chunk)
+        chunks.append(stream[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def legacy_decode(chunks):
+    # The pre-decoder path: '#'-delimited, utf-8 decoded, sliced and int()'d per frame
+    count = 0
+    data = bytearray()
+    for chunk in chunks:
+        for i in range(len(chunk)):
+            byte = chunk[i:i + 1]
+            data.extend(byte)
+            if byte != b'#':
+                continue
+            frame = data.decode('utf-8', errors='replace')
+            data = bytearray()
+            try:
+                if frame[1:5] == "TEP:":
+                    int(frame[5:len(frame) - 1])
+                elif frame[1:5] == "FRC:":
+                    int(frame[5:len(frame) - 1]) / 100
+                count += 1
+            except ValueError:
+                pass
+    return count
+
+
+def run(label, func, chunks, total_bytes):
+    start = time.perf_counter()
+    frames = func(chunks)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {frames:>10} frames  {elapsed * 1000:9.1f} ms  "
+          f"{frames / elapsed:12,.0f} frames/s  {total_bytes / elapsed / 1e6:7.1f} MB/s")
+
+
+def decoder_decode(chunks):
+    decoder = FrameDecoder()
+    count = 0
+    for chunk in chunks:
+        count += len(decoder.feed(chunk))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file', help='raw byte capture to decode instead of a synthetic stream')
+    parser.add_argument('--frames', type=int, default=1_000_000)
+    parser.add_argument('--chunk', type=int, default=4096, help='maximum chunk size fed per call')
+    parser.add_argument('--legacy', action='store_true', help='also time the old per-byte path')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'rb') as f:
+            stream = f.read()
+    else:
+        stream = synthetic_stream(args.frames)
+    chunks = split_chunks(stream, args.chunk)
+    print(f"{len(stream):,} bytes in {len(chunks):,} chunks (max {args.chunk} bytes)")
+    run("FrameDecoder", decoder_decode, chunks, len(stream))
+    if args.legacy:
+        run("legacy", legacy_decode, chunks, len(stream))
+
+
+if __name__ == '__main__':
+    main()
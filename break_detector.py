@@ -0,0 +1,84 @@
+import time
+
+from protocol import ForceMsg, ModeMsg
+
+BREAK_DROP = 0.5                # a break is the force falling this fraction below the running peak
+MIN_PEAK_FORCE = 1.0            # g the peak must reach before a drop can count as a break
+CONFIRM_SAMPLES = 3             # consecutive samples past the threshold, so one noisy frame cannot stop a run
+
+
+class BreakDetector:
+    """Online break detection on the acquisition thread.
+
+    feed() sees every decoded batch before the GUI does. While the machine
+    reports PROCESSING it tracks the running peak and fires once, either when
+    the force falls BREAK_DROP below the peak or, with stop_force set, when
+    the force reaches stop_force (the recipe's PeakForce). The caller sends
+    the pause command and reports the write time back through sent().
+    """
+
+    def __init__(self, command, drop=BREAK_DROP, stop_force=None, min_peak=MIN_PEAK_FORCE,
+                 confirm=CONFIRM_SAMPLES, mode="READY"):
+        self.command = command
+        self.drop = drop
+        self.stop_force = stop_force
+        self.min_peak = min_peak
+        self.confirm = confirm
+        self.mode = mode
+        self.peak_force = 0.0
+        self.trigger = None         # ForceMsg that fired the detector
+        self.reason = None
+        self.sent_ns = None
+        self._count = 0
+
+    @property
+    def triggered(self):
+        return self.trigger is not None
+
+    @property
+    def latency_ms(self):
+        """Receipt of the triggering frame to the pause command leaving the PC."""
+        if self.sent_ns is None:
+            return None
+        return (self.sent_ns - self.trigger.t_ns) / 1e6
+
+    def feed(self, messages):
+        """Returns the triggering ForceMsg the first time the detector fires, else None."""
+        if self.trigger is not None:
+            return None
+        mode = self.mode
+        peak = self.peak_force
+        count = self._count
+        floor = peak * (1.0 - self.drop)
+        stop_force = self.stop_force
+        for message in messages:
+            kind = type(message)
+            if kind is ForceMsg:
+                if mode != "PROCESSING":
+                    continue
+                value = message.value
+                if value > peak:
+                    peak = value
+                    floor = peak * (1.0 - self.drop)
+                if stop_force is not None and value >= stop_force:
+                    reason = "peak force"
+                elif peak >= self.min_peak and value <= floor:
+                    reason = "break"
+                else:
+                    count = 0
+                    continue
+                count += 1
+                if count >= self.confirm:
+                    self.trigger = message
+                    self.reason = reason
+                    break
+            elif kind is ModeMsg:
+                mode = message.mode
+                count = 0
+        self.mode = mode
+        self.peak_force = peak
+        self._count = count
+        return self.trigger
+
+    def sent(self, t_ns=None):
+        self.sent_ns = time.monotonic_ns() if t_ns is None else t_ns
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QThread
+from PyQt5.QtGui import QImage, QPixmap
+
+READ_RETRY_MS = 100
+
+
+class CameraWorker(QThread):
+    """Owns the capture device on its own thread and keeps only the newest frame.
+
+    The device is opened when the thread starts and released when it stops.
+    Consumers call latest() at their own rate; frames nobody picked up in
+    time are simply replaced, so a slow camera or a slow consumer never
+    blocks the other side.
+    """
+
+    def __init__(self, device=0, parent=None):
+        super().__init__(parent)
+        self.device = device
+        self.failed = False
+        # Optional VideoRecorder; receives every captured frame, not only displayed ones
+        self.recorder = None
+        self._lock = threading.Lock()
+        self._frame = None
+        self._timestamp_ns = 0
+        self._seq = 0
+        # Set before the thread starts so a stop() during the device open sticks
+        self._running = True
+
+    def run(self):
+        capture = cv2.VideoCapture(self.device)
+        if not capture.isOpened():
+            print(f"Camera {self.device} could not be opened")
+            self.failed = True
+            capture.release()
+            return
+        # If stop() came during the open the loop is skipped and the device released
+        try:
+            while self._running:
+                ret, frame = capture.read()
+                if not ret:
+                    self.failed = True
+                    self.msleep(READ_RETRY_MS)
+                    continue
+                timestamp_ns = time.monotonic_ns()
+                with self._lock:
+                    self._frame = frame
+                    self._timestamp_ns = timestamp_ns
+                    self._seq += 1
+                self.failed = False
+                recorder = self.recorder
+                if recorder is not None:
+                    recorder.submit(frame, timestamp_ns)
+        finally:
+            capture.release()
+            self._running = False
+
+    def latest(self):
+        """Return (seq, frame, monotonic timestamp in ns) of the newest frame."""
+        with self._lock:
+            return self._seq, self._frame, self._timestamp_ns
+
+    def stop(self):
+        self._running = False
+        self.wait()
+
+
+class FramePresenter:
+    """Turns captured BGR frames into pixmaps sized for a target label.
+
+    Geometry comes from the frame itself. The frame is scaled once, straight
+    into a buffer that is reused while the frame and label sizes stay the
+    same. QImage wraps that buffer without copying, and where Qt can read BGR
+    directly the colour conversion pass is skipped as well.
+    """
+
+    def __init__(self):
+        self._scaled = None
+        self._rgb = None
+        self._bgr_format = getattr(QImage, 'Format_BGR888', None)
+
+    def present(self, frame, label):
+        target = label.contentsRect().size()
+        height, width = frame.shape[:2]
+        scale = min(target.width() / width, target.height() / height)
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        if size != (width, height):
+            shape = (size[1], size[0]) + frame.shape[2:]
+            if self._scaled is None or self._scaled.shape != shape:
+                self._scaled = np.empty(shape, dtype=frame.dtype)
+            cv2.resize(frame, size, dst=self._scaled, interpolation=cv2.INTER_AREA)
+            frame = self._scaled
+        elif not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+
+        if frame.ndim == 2:
+            image_format = QImage.Format_Grayscale8
+        elif self._bgr_format is not None:
+            image_format = self._bgr_format
+        else:
+            if self._rgb is None or self._rgb.shape != frame.shape:
+                self._rgb = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            frame = self._rgb
+            image_format = QImage.Format_RGB888
+
+        image = QImage(frame.data, frame.shape[1], frame.shape[0], frame.strides[0], image_format)
+        # fromImage copies the pixels, so the buffers are free for the next frame
+        label.setPixmap(QPixmap.fromImage(image))
@@ -0,0 +1,186 @@
+import collections
+import threading
+import time
+
+import serial
+from PyQt5.QtCore import QThread, pyqtSignal
+
+COMMAND_TIMEOUT = 1.0           # seconds to wait for the expected *PRS: reply
+COMMAND_RETRIES = 1             # resends after a timeout before a command is reported failed
+RTT_HISTORY = 256
+
+# Reasons passed with CommandQueue.command_failed
+NO_SERIAL_PORT = "NO SERIAL PORT"
+WRITE_FAILED = "SERIAL WRITE FAILED"
+NO_REPLY = "NO REPLY FROM MACHINE"
+STOPPED = "COMMAND QUEUE STOPPED"
+
+
+class CommandError(Exception):
+    pass
+
+
+class Command:
+    """One queued frame; ``expect`` is the mode the machine must report back, if any."""
+
+    __slots__ = ('data', 'expect', 'key', 'retries', 'timeout', 'attempts', 'sent_ns', 'ack_ns',
+                 'error', '_done')
+
+    def __init__(self, data, expect=None, key=None, retries=COMMAND_RETRIES, timeout=COMMAND_TIMEOUT):
+        self.data = data
+        self.expect = expect
+        self.key = key
+        self.retries = retries
+        self.timeout = timeout
+        self.attempts = 0
+        self.sent_ns = None
+        self.ack_ns = None
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def rtt_ms(self):
+        if self.ack_ns is None:
+            return None
+        return (self.ack_ns - self.sent_ns) / 1e6
+
+    def wait(self, timeout=None):
+        """Block until the command was written (and acknowledged); raises CommandError if it failed."""
+        if not self._done.wait(timeout):
+            raise CommandError(f"{self.data} still pending after {timeout:g} s")
+        if self.error is not None:
+            raise CommandError(f"{self.data}: {self.error}")
+        return self
+
+
+class CommandQueue(QThread):
+    """Writes outbound frames on its own thread so a slow port never blocks the GUI.
+
+    Commands go out in submission order. One that expects a reply holds the
+    queue until the matching *PRS: frame arrives (fed in by SerialWorker via
+    acknowledge()), is resent after a timeout, and is reported through
+    command_failed when the retries run out. A command submitted with a key
+    replaces a queued, not yet written command with the same key, so fast
+    toggles on the manual screen collapse into the final state.
+    """
+
+    command_acked = pyqtSignal(str, float)
+    command_failed = pyqtSignal(str, str)
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.ser = ser
+        self.rtt_ms = collections.deque(maxlen=RTT_HISTORY)
+        self.awaiting = None
+        self._pending = collections.deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._running = True
+
+    def submit(self, data, expect=None, key=None, retries=COMMAND_RETRIES, timeout=COMMAND_TIMEOUT):
+        command = Command(data, expect, key, retries, timeout)
+        with self._cond:
+            if not self._running:
+                self._finish(command, STOPPED, emit=False)
+                return command
+            if key is not None:
+                for i, queued in enumerate(self._pending):
+                    if queued.key == key:
+                        self._finish(queued, None, emit=False)
+                        self._pending[i] = command
+                        return command
+            self._pending.append(command)
+            self._cond.notify_all()
+        return command
+
+    def send_now(self, data):
+        """Write from the calling thread, ahead of anything queued; returns the Command.
+
+        For commands that cannot wait behind the queue, such as the break
+        detector's TX_PAUSE from the serial read thread. No reply is awaited,
+        the machine's mode report reaches the GUI as usual.
+        """
+        command = Command(data, retries=0)
+        command.attempts = 1
+        try:
+            with self._write_lock:
+                command.sent_ns = time.monotonic_ns()
+                self.ser.write(data.encode())
+        except (serial.SerialException, OSError) as e:
+            print(f"Write of {data} failed: {e}")
+            self._finish(command, WRITE_FAILED)
+            return command
+        self._finish(command, None)
+        return command
+
+    def acknowledge(self, message):
+        """Match a ModeMsg against the command in flight; safe to call from any thread."""
+        with self._cond:
+            command = self.awaiting
+            if command is None or message.mode != command.expect or message.t_ns < command.sent_ns:
+                return
+            command.ack_ns = message.t_ns
+            self.awaiting = None
+            self._cond.notify_all()
+
+    def run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._running:
+                    break
+                command = self._pending.popleft()
+            self._send(command)
+        with self._cond:
+            while self._pending:
+                self._finish(self._pending.popleft(), STOPPED, emit=False)
+
+    def _send(self, command):
+        encoded = command.data.encode()
+        while command.attempts <= command.retries:
+            command.attempts += 1
+            with self._cond:
+                command.sent_ns = time.monotonic_ns()
+                if command.expect is not None:
+                    self.awaiting = command
+            try:
+                with self._write_lock:
+                    self.ser.write(encoded)
+            except (serial.SerialException, OSError) as e:
+                print(f"Write of {command.data} failed: {e}")
+                with self._cond:
+                    self.awaiting = None
+                self._finish(command, WRITE_FAILED)
+                return
+            if command.expect is None:
+                self._finish(command, None)
+                return
+            with self._cond:
+                self._cond.wait_for(lambda: command.ack_ns is not None or not self._running, command.timeout)
+                self.awaiting = None
+                if command.ack_ns is not None:
+                    break
+                if not self._running:
+                    self._finish(command, STOPPED, emit=False)
+                    return
+            print(f"No {command.expect} reply to {command.data} within {command.timeout:g} s "
+                  f"(attempt {command.attempts})")
+        if command.ack_ns is None:
+            self._finish(command, NO_REPLY)
+            return
+        rtt = command.rtt_ms
+        self.rtt_ms.append(rtt)
+        self._finish(command, None)
+        self.command_acked.emit(command.data, rtt)
+
+    def _finish(self, command, error, emit=True):
+        command.error = error
+        command._done.set()
+        if error is not None and emit:
+            self.command_failed.emit(command.data, error)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self.wait()
@@ -0,0 +1,139 @@
+import contextlib
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+CONFIG_FILE = 'ConfigFile.csv'
+CONFIG_FIELDS = ['ConfigName', 'Linear Speed', 'Distance', 'Temperature', 'PeakForce']
+LOCK_TIMEOUT = 5.0      # seconds; a lock file held longer is left over from a crash
+LOCK_POLL = 0.02        # seconds between attempts to take the lock
+
+
+class ConfigRepository:
+    """Process recipes from ConfigFile.csv, indexed by ConfigName.
+
+    The file is parsed once and reparsed only when its mtime or size
+    changes, so another station editing the shared file is still picked up.
+    Changes are made under a lock file next to the CSV, so stations sharing
+    it do not overwrite each other: add appends a row, delete replaces the
+    whole file atomically (temp file + rename, keeping the file's mode), so
+    a crash never leaves a half-written recipe list behind.
+    """
+
+    def __init__(self, path=CONFIG_FILE):
+        self.path = path
+        self._configs = {}
+        self._stamp = None
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._configs = {}
+            self._stamp = None
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        configs = {}
+        with open(self.path, 'r', newline='') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                # Older files hold duplicate names; the first row wins, as it always has
+                if row and row[0] not in configs:
+                    configs[row[0]] = row
+        self._configs = configs
+        self._stamp = stamp
+
+    def names(self):
+        self._refresh()
+        return list(self._configs)
+
+    def get(self, name):
+        self._refresh()
+        row = self._configs.get(name)
+        return list(row) if row is not None else None
+
+    def __contains__(self, name):
+        self._refresh()
+        return name in self._configs
+
+    def __len__(self):
+        self._refresh()
+        return len(self._configs)
+
+    def add(self, row):
+        with self._locked():
+            self._refresh()
+            if row[0] in self._configs:
+                raise ValueError(f"Configuration {row[0]!r} already exists")
+            with open(self.path, 'a', newline='') as file:
+                writer = csv.writer(file)
+                if file.tell() == 0:
+                    writer.writerow(CONFIG_FIELDS)
+                writer.writerow(row)
+                file.flush()
+                os.fsync(file.fileno())
+            self._configs[row[0]] = list(row)
+            self._stamp_file()
+
+    def delete(self, name):
+        with self._locked():
+            self._refresh()
+            if name not in self._configs:
+                return False
+            configs = dict(self._configs)
+            del configs[name]
+            self._write(configs)
+        return True
+
+    @contextlib.contextmanager
+    def _locked(self):
+        lock_path = self.path + '.lock'
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() < deadline:
+                    time.sleep(LOCK_POLL)
+                    continue
+                print(f"Removing stale lock {lock_path}")
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(lock_path)
+                deadline = time.monotonic() + LOCK_TIMEOUT
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.unlink(lock_path)
+
+    def _stamp_file(self):
+        stat = os.stat(self.path)
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def _write(self, configs):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix='.ConfigFile.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(CONFIG_FIELDS)
+                writer.writerows(configs.values())
+                file.flush()
+                os.fsync(file.fileno())
+            # mkstemp creates the file 0600; keep the shared file readable to other accounts
+            shutil.copymode(self.path, temp_path)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self._configs = configs
+        self._stamp_file()
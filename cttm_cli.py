@@ -0,0 +1,155 @@
+"""Headless CTTM test runner for batch and overnight qualification.
+
+    python cttm_cli.py --config config1 --port /dev/ttyUSB0
+
+Runs one test without the GUI. It loads the recipe from ConfigFile.csv and
+sends the same TX_START frame start_process builds. Every decoded sample is
+streamed to a run log (see run_log.py). The run ends when the machine leaves
+PROCESSING, or when --max-duration runs out and TX_PAUSE is sent. The tester
+is then reset and the peak force is compared to the recipe's PeakForce.
+The verdict comes from analysis.py over the PROCESSING part of the log.
+Only the protocol, config and run log modules are imported at start, so
+no Qt, matplotlib or OpenCV; analysis.py and SciPy load after the run.
+read_messages, run_test and report_verdict are shared with multi_machine.py.
+
+Exit status: 0 pass, 1 fail, 2 could not run (bad recipe, port, timeout).
+"""
+import argparse
+import sys
+import time
+
+import serial
+
+from config_store import ConfigRepository, CONFIG_FILE
+from protocol import (FrameDecoder, ModeMsg, TX_START, TX_PAUSE, TX_RESET,
+                      format_process_command)
+from run_log import RunLogger, new_run_log_path, RUN_LOG_DIR
+
+EXIT_PASS = 0
+EXIT_FAIL = 1
+EXIT_ERROR = 2
+READ_CHUNK_SIZE = 4096
+
+
+def read_messages(ser, decoder):
+    """Decode whatever the port has waiting, blocking up to its timeout for the first byte."""
+    chunk = ser.read(min(max(ser.in_waiting, 1), READ_CHUNK_SIZE))
+    if not chunk:
+        return []
+    return decoder.feed(chunk, time.monotonic_ns())
+
+
+def run_test(machine, start_timeout=10.0, max_duration=600.0, home_timeout=60.0):
+    """START, wait out PROCESSING (TX_PAUSE after max_duration), then RESET until READY.
+
+    ``machine`` provides name, mode, error, send(template) and
+    wait_for(predicate, timeout), which returns False on timeout or when
+    error is set. Returns None when the run finished, otherwise an error message.
+    """
+    machine.send(TX_START)
+    if not machine.wait_for(lambda m: m.mode == "PROCESSING", start_timeout):
+        return machine.error or f"machine did not start within {start_timeout:g} s"
+    if not machine.wait_for(lambda m: m.mode != "PROCESSING", max_duration):
+        if machine.error:
+            return machine.error
+        print(f"Stopping {machine.name} after {max_duration:g} s of PROCESSING")
+        machine.send(TX_PAUSE)
+        if not machine.wait_for(lambda m: m.mode != "PROCESSING", start_timeout):
+            return machine.error or "machine did not pause"
+    machine.send(TX_RESET)
+    if not machine.wait_for(lambda m: m.mode == "READY", home_timeout):
+        return machine.error or f"machine did not report READY within {home_timeout:g} s of reset"
+    return None
+
+
+def report_verdict(name, error, log_path):
+    """Print the verdict of a run from its log and return the exit status."""
+    if error is not None:
+        print(f"ERROR {name}: {error}")
+        return EXIT_ERROR
+    from analysis import analyze_run_log, format_analysis
+    result = analyze_run_log(log_path)
+    print(f"{name} {format_analysis(result)}, log {log_path}")
+    return EXIT_PASS if result.passed else EXIT_FAIL
+
+
+class HeadlessRun:
+
+    def __init__(self, ser, config, run_logger, verbose=False):
+        self.ser = ser
+        self.config = config
+        self.run_logger = run_logger
+        self.verbose = verbose
+        self.name = config[0]
+        self.decoder = FrameDecoder()
+        self.mode = None
+        # Port failures raise SerialException here, so this stays None
+        self.error = None
+
+    def send(self, template):
+        command = format_process_command(template, self.config)
+        if self.verbose:
+            print(f"TX {command}")
+        self.ser.write(command.encode())
+
+    def poll(self):
+        messages = read_messages(self.ser, self.decoder)
+        if not messages:
+            return
+        self.run_logger.log_messages(messages)
+        for message in messages:
+            if type(message) is ModeMsg and message.mode != self.mode:
+                self.mode = message.mode
+                if self.verbose:
+                    print(f"mode {self.mode}")
+
+    def wait_for(self, predicate, timeout):
+        deadline = time.monotonic() + timeout
+        while not predicate(self):
+            if time.monotonic() >= deadline:
+                return False
+            self.poll()
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', required=True, help='ConfigName of the recipe to run')
+    parser.add_argument('--port', required=True, help='serial port of the tester')
+    parser.add_argument('--config-file', default=CONFIG_FILE)
+    parser.add_argument('--log-dir', default=RUN_LOG_DIR)
+    parser.add_argument('--baudrate', type=int, default=115200)
+    parser.add_argument('--start-timeout', type=float, default=10.0, help='seconds to wait for RX_START')
+    parser.add_argument('--max-duration', type=float, default=600.0, help='seconds of PROCESSING before TX_PAUSE is sent')
+    parser.add_argument('--home-timeout', type=float, default=60.0, help='seconds to wait for RX_READY after reset')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    config = ConfigRepository(args.config_file).get(args.config)
+    if config is None:
+        print(f"ERROR: configuration {args.config!r} not found in {args.config_file}", file=sys.stderr)
+        return EXIT_ERROR
+    try:
+        ser = serial.Serial(args.port, baudrate=args.baudrate, timeout=0.1)
+    except serial.SerialException as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    run_logger = RunLogger(new_run_log_path(args.log_dir), config)
+    run = HeadlessRun(ser, config, run_logger, verbose=args.verbose)
+    try:
+        error = run_test(run, args.start_timeout, args.max_duration, args.home_timeout)
+    except serial.SerialException as e:
+        error = f"serial port failed: {e}"
+    except KeyboardInterrupt:
+        run.send(TX_PAUSE)
+        error = "interrupted"
+    finally:
+        ser.close()
+        run_logger.close()
+
+    return report_verdict(args.config, error, run_logger.path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,61 +1,103 @@
-import os, sys, csv, random
+import os, sys, random, time
+from startup_profile import StartupProfile
+startup = StartupProfile()
 from PyQt5 import QtWidgets, QtGui, QtCore, uic
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout,QMessageBox,QGraphicsDropShadowEffect, QLineEdit
-from PyQt5.QtGui import QPixmap, QImage, QIntValidator, QDoubleValidator, QIcon,QFont
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget,QMessageBox,QGraphicsDropShadowEffect, QLineEdit, QStackedWidget
+from PyQt5.QtGui import QPixmap, QIntValidator, QDoubleValidator,QFont
 from PyQt5.QtCore import Qt, QTimer, QSize
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 from datetime import datetime
 import serial.tools.list_ports
 import serial 
 from main3 import VirtualKeyboard
-from PIL import Image, ImageOps
-import cv2
+from serial_worker import SerialWorker
+from command_queue import CommandQueue, NO_SERIAL_PORT
+from break_detector import BreakDetector
+from port_watcher import PortWatcher
+from serial_capture import SerialCapture, ReplayPort, new_capture_path, replay_speed
+from scheduler import RefreshScheduler
+from ring_buffer import RingBuffer
+from run_log import RunLogger, new_run_log_path
+from config_store import ConfigRepository, CONFIG_FILE
+from recipe_db import SqliteConfigRepository
+from protocol import (TX_START, TX_PAUSE, TX_RESET, format_process_command,
+                      TX_MOTOR_FORWARD_START, TX_MOTOR_FORWARD_STOP,
+                      TX_MOTOR_BACKWARD_START, TX_MOTOR_BACKWARD_STOP,
+                      TX_VALVE1_OPEN, TX_VALVE1_CLOSE, TX_VALVE2_OPEN, TX_VALVE2_CLOSE,
+                      TX_HEATER_START, TX_HEATER_STOP,
+                      ForceMsg, TemperatureMsg, ModeMsg)
 import numpy as np
+from ui_loader import load_ui
+from resources import ResourceCache
+# live_plot (matplotlib), camera and recorder (OpenCV) and analysis (SciPy) are
+# imported on first use, see load_acquisition_modules
 base_path = "."
 
+# Build the window from a cached, precompiled copy of ui_cttm.ui (see ui_loader.py)
+UI_CACHE = True
+
+# Applied once to the whole window; screens no longer restyle it on every switch
+WINDOW_STYLE = "background-color:rgb(250,250,250);"
+
+# Presentation refresh rates (Hz); serial data is event driven and not polled
+CAMERA_FPS = 30
+PLOT_FPS = 20
+# Labels at about the display refresh, as when rx_data set them on every frame
+LABEL_FPS = 60
+
+# Live plot series: samples retained in memory and samples shown on screen
+SAMPLE_HISTORY = 4096
+PLOT_WINDOW = 25
+
+# Specimen pull videos, one per run, next to a CSV of frame timestamps
+RECORDING_DIR = "recordings"
+RECORDING_FPS = 30
+
+# Recipe storage: "csv" uses ConfigFile.csv directly, "sqlite" uses CONFIG_DB_FILE
+# (imported once from ConfigFile.csv) and also keeps a history of completed runs
+CONFIG_BACKEND = "csv"
+CONFIG_DB_FILE = "cttm.db"
+
+# Pause the machine from the acquisition thread when the specimen breaks; with
+# STOP_AT_PEAK_FORCE it also stops once the recipe's PeakForce is reached
+AUTO_STOP_ON_BREAK = True
+STOP_AT_PEAK_FORCE = False
+
+# Ports not reported by list_ports, e.g. the pty of simulator.py
+EXTRA_SERIAL_PORTS = [port for port in os.environ.get("CTTM_EXTRA_PORTS", "").split(os.pathsep) if port]
+SERIAL_OPTIONS = dict(baudrate=115200, timeout=1)
+
+# CTTM_CAPTURE=1 tees every byte read from the machine to CAPTURE_DIR.
+# CTTM_REPLAY=<capture> plays a capture back instead of opening a port, at
+# CTTM_REPLAY_SPEED times the recorded pace (default 1; 0 or max = as fast as possible).
+CAPTURE_SERIAL = os.environ.get("CTTM_CAPTURE") == "1"
+CAPTURE_DIR = "captures"
+REPLAY_FILE = os.environ.get("CTTM_REPLAY")
+
 
 # To run this app in PC environment without building exe, comment the lines below  
 #base_path = sys._MEIPASS
 # To build this code make sure all paths have "/" to change directory.
 
 
-
-#==============COMMUNICATION PROTOCOLS==============
-#--------------------AUTO PAGE----------------------
-ON_PROCESS_PAGE="*3:5#"
-RX_MODE="*PRS:"
-TX_START="*1:1:{}:{}:{}:{}#"        #sent from pc
-RX_START="*PRS:STR#"                #expected from machine
-TX_PAUSE="*1:2:{}:{}:{}:{}#"        #send from pc
-RX_PAUSE="*PRS:PUS#"                #expected from machine
-TX_RESET="*1:3 :{}:{}:{}:{}#"       #sent from pc
-RX_RESET="*PRS:HOM#"                #expected from machine
-RX_READY="*PRS:RED#"                #expected from machine when ready
-#----------------------VALUES----------------------
-RX_TEMPERATURE="*TEP:xxx#"
-RX_FORCE="*FRC:xxxxxx#"
-#--------------------MANUAL PAGE-------------------
-TX_MOTOR_FORWARD_START="*2:4:1:1#"
-TX_MOTOR_FORWARD_STOP="*2:4:2:1#"
-TX_MOTOR_BACKWARD_START="*2:4:1:2#"
-TX_MOTOR_BACKWARD_STOP="*2:4:2:2#"
-TX_VALVE1_OPEN="*2:5:2#"
-TX_VALVE1_CLOSE="*2:5:1#"
-TX_VALVE2_OPEN="*2:6:1#"
-TX_VALVE2_CLOSE="*2:6:2#"
-TX_HEATER_START="*2:7:1#"
-TX_HEATER_STOP="*2:7:2#"
-#=======================================================
-
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
-        uic.loadUi(f'{base_path}/ui_cttm.ui', self)
- 
- 
-        self.button_A.setIcon(QIcon(base_path+"/rsc/rsc3.png"))
+        if UI_CACHE:
+            load_ui(f'{base_path}/ui_cttm.ui', self)
+        else:
+            uic.loadUi(f'{base_path}/ui_cttm.ui', self)
+        startup.mark("load UI")
+        self.resources = ResourceCache(base_path + "/rsc")
+        # The six screen frames share one geometry; a stacked widget shows one of them
+        self.screen_pages = [self.screen_1, self.screen_2, self.screen_3,
+                             self.screen_4, self.screen_5, self.screen_6]
+        self.screens = QStackedWidget(self.centralwidget)
+        self.screens.setGeometry(self.screen_1.geometry())
+        for page in self.screen_pages:
+            self.screens.addWidget(page)
+        self.screens_set_up = set()
+
+        self.button_A.setIcon(self.resources.icon("rsc3.png"))
         self.button_A.setIconSize(QSize(40, 40))
         font_52 = QFont('SF Pro Display', 52, QFont.Bold)
         font_27 = QFont('SF Pro Display', 27, QFont.Bold)
@@ -87,15 +129,34 @@ class MainWindow(QtWidgets.QMainWindow):
         self.label_41.setFont(font_27)
         self.label_47.setFont(font_27)
         self.label_46.setFont(font_27)
+        startup.mark("fonts and focus")
         self.mode = "READY"
         self.screen = 0
         self.int_validator = QIntValidator(self)
         self.process_config = []
-        self.time_data = []
-        self.force_data = []
+        if CONFIG_BACKEND == "sqlite":
+            self.configs = SqliteConfigRepository(CONFIG_DB_FILE, import_csv=CONFIG_FILE)
+        else:
+            self.configs = ConfigRepository(CONFIG_FILE)
+        self.time_data = RingBuffer(SAMPLE_HISTORY)
+        self.force_data = RingBuffer(SAMPLE_HISTORY)
+        # Receipt stamps of the plotted samples and their receive-to-render latency (ms)
+        self.stamp_data = RingBuffer(SAMPLE_HISTORY, np.int64)
+        self.latency_data = RingBuffer(SAMPLE_HISTORY)
+        self.rendered_samples = 0
+        self.run_start_ns = None
         self.rx_temperature = 0
         self.rx_force = 0
+        self.live_plot = None
+        self.plot_dirty = False
+        self.labels_dirty = False
         self.ser = None
+        self.port_device = None
+        self.port_identity = None
+        self.capture = None
+        self.serial_worker = None
+        self.command_queue = None
+        self.break_detector = None
         self.heater=False
         self.valve1=False
         self.valve2=False
@@ -103,13 +164,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.motor_right=False
         # self.disable_osk()
 
-        self.camera = cv2.VideoCapture(0)
+        # Opened only while the auto/manual screens are shown
+        self.camera = None
+        self.camera_seq = 0
+        self.frame_presenter = None
+        self.acquisition_loaded = False
+        self.recorder = None
+        self.run_logger = None
         
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.display_cam)
-        # self.timer.timeout.connect(self.display_cam2)
-        self.timer2 = QTimer()
-        self.timer2.timeout.connect(self.rx_data)
+        self.scheduler = RefreshScheduler(self)
+        self.scheduler.add("camera", self.display_cam, CAMERA_FPS)
+        self.scheduler.add("plot", self.display_plot, PLOT_FPS, start=True)
+        self.scheduler.add("labels", self.refresh_labels, LABEL_FPS, start=True)
         
         self.button_1.clicked.connect(self.handle_verify_login)
         self.button_A.pressed.connect(self.handle_button_A_pressed)
@@ -142,10 +208,37 @@ class MainWindow(QtWidgets.QMainWindow):
         self.input_17.setValidator(self.int_validator)
         self.showPopup2 = self.comboBox.showPopup 
         self.comboBox.showPopup= self.load_comlist
-        self.load_comlist()
-        self.comboBox.currentIndexChanged.connect(self.set_serial)
+        self.port_watcher = PortWatcher(EXTRA_SERIAL_PORTS, SERIAL_OPTIONS)
+        self.port_watcher.refresh()
+        self.update_comlist(self.port_watcher.ports)
+        self.port_watcher.ports_changed.connect(self.update_comlist, Qt.QueuedConnection)
+        self.port_watcher.reconnected.connect(self.handle_serial_reconnected, Qt.QueuedConnection)
+        self.port_watcher.start()
+        # activated, unlike currentIndexChanged, also fires when the shown port is picked again
+        self.comboBox.activated.connect(self.set_serial)
+        self.setStyleSheet(WINDOW_STYLE)
         self.handle_screen_change(1)
+        if REPLAY_FILE:
+            self.start_replay(REPLAY_FILE, replay_speed(os.environ.get("CTTM_REPLAY_SPEED")))
         #self.disable_osk()
+        startup.mark("window state")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not startup.reported:
+            startup.mark("show and first paint")
+            startup.report()
+            # Decode the remaining rsc/ images once the window is up
+            QTimer.singleShot(0, self.resources.preload)
+
+    def load_acquisition_modules(self):
+        # matplotlib, OpenCV and SciPy are first needed on screens 5 and 6
+        if self.acquisition_loaded:
+            return
+        start = time.perf_counter()
+        import live_plot, camera, recorder, analysis
+        self.acquisition_loaded = True
+        print(f"Loaded plot, camera and analysis modules in {(time.perf_counter() - start) * 1000:.0f} ms")
 
     def disable_osk(self):
        #val=os.envirn["QT_IM_MODULE"] #= "none"
@@ -178,21 +271,17 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.screen not in [1, 3]:  # Only allow the keyboard on screen 1 and 3
             return
 
-        if self.keyboard is None or not self.keyboard.isVisible():
-            # If no keyboard is open, create a new one
+        # One keyboard for the whole session, created on first use and retargeted
+        if self.keyboard is None:
             self.keyboard = VirtualKeyboard(input_field, self)
-            self.keyboard.finished.connect(self.on_keyboard_closed)  # Reset the flag when the keyboard closes
-            self.keyboard.show()
         else:
-            # If a keyboard is already open, change the focused input field
-            self.keyboard.input_field = input_field
-
-    def on_keyboard_closed(self):
-        # Safely reset the keyboard reference when it's closed
-        self.keyboard = None
+            self.keyboard.set_target(input_field)
+        if not self.keyboard.isVisible():
+            self.keyboard.show()
     
 
     def handle_screen_change(self, value):
+        start = time.perf_counter()
         # Call close_keyboard to ensure the virtual keyboard is closed when switching screens
         self.close_keyboard()
         
@@ -226,11 +315,21 @@ class MainWindow(QtWidgets.QMainWindow):
             self.comboBox.show()
             self.comboBox.setDisabled(False)
             self.init_screen_6()
+        print(f"Screen {value} shown in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def show_screen(self, number):
+        # A screen's one-time setup runs on its first visit; after that a switch is a page flip
+        if number not in self.screens_set_up:
+            setup = getattr(self, f"setup_screen_{number}", None)
+            if setup is not None:
+                setup()
+            self.screens_set_up.add(number)
+        self.screen = number
+        self.screens.setCurrentWidget(self.screen_pages[number - 1])
 
     def close_keyboard(self):
         if self.keyboard is not None:
-            self.keyboard.close()  # Close the keyboard if open
-            self.keyboard = None
+            self.keyboard.hide()  # Hidden, not destroyed; reused on the next input field
              
 
 
@@ -238,49 +337,39 @@ class MainWindow(QtWidgets.QMainWindow):
     def handle_button_A_pressed(self):
         self.button_A.setIconSize(QSize(36, 36))
 
-    def init_screen_1(self):
-        self.screen = 1
-        self.screen_2.hide()
-        self.screen_3.hide()
-        self.screen_4.hide()
-        self.screen_5.hide()
-        self.screen_6.hide()
-        self.screen_1.show()
-        self.setStyleSheet("background-color:rgb(250,250,250);")
-        self.label_A.setPixmap(QPixmap(base_path+"/rsc/rsc2.png"))
-        self.label_6.hide()
-        
-         # Connect input_1 and input_2 to trigger virtual keyboard when clicked
+    def setup_screen_1(self):
+        # Connect input_1 and input_2 to trigger virtual keyboard when clicked
         self.input_1.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_1, event)
         self.input_2.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_2, event)
 
+    def init_screen_1(self):
+        self.show_screen(1)
+        self.stop_camera()
+        self.label_A.setPixmap(self.resources.pixmap("rsc2.png"))
+        self.label_6.hide()
+
     def handle_focus_event(self, event):
         self.show_virtual_keyboard(event)
         QLineEdit.focusInEvent(self.sender(), event)  # Call the original focus event
   
     def init_screen_2(self):
-        self.screen = 2
-        self.setStyleSheet("background-color:rgb(250,250,250);")
+        self.show_screen(2)
+        self.stop_camera()
         self.label_A.setPixmap(QPixmap())
         self.label_A.setText("Main Menu")
-        self.screen_1.hide()
-        self.screen_3.hide()
-        self.screen_4.hide()
-        self.screen_5.hide()
-        self.screen_6.hide()
 
-        self.screen_2.show()
           
+    def setup_screen_3(self):
+        self.input_13.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_13, event)
+        self.input_14.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_14, event)
+        self.input_15.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_15, event)
+        self.input_16.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_16, event)
+        self.input_17.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_17, event)
+
     def init_screen_3(self):
-        self.screen = 3
+        self.show_screen(3)
+        self.stop_camera()
         self.label_A.setText("Create Configuration")
-        self.screen_1.hide()
-        self.screen_2.hide()
-        self.screen_4.hide()
-        self.screen_5.hide()
-        self.screen_6.hide()
-        self.screen_3.show()
-        self.setStyleSheet("background-color:rgb(250,250,250);")
         self.label_64.setStyleSheet("color:#FF0000;")
         self.label_64.setText("")
         self.input_13.clear()
@@ -288,19 +377,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.input_15.clear()
         self.input_16.clear()
         self.input_17.clear()
-        
-        self.input_13.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_13, event)
-        self.input_14.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_14, event)
-        self.input_15.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_15, event)
-        self.input_16.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_16, event)
-        self.input_17.focusInEvent = lambda event: self.show_virtual_keyboard(self.input_17, event)
 
     def handle_focus_event(self, event):
         self.show_virtual_keyboard(event)
         QLineEdit.focusInEvent(self.sender(), event)  # Call the original focus event
 
     def init_screen_4(self,delete):
-        self.screen = 4
+        self.show_screen(4)
+        self.stop_camera()
         if(delete):
             self.label_A.setText("Delete Configuration")
             self.button_5.hide()
@@ -314,13 +398,6 @@ class MainWindow(QtWidgets.QMainWindow):
             self.button_12.show()
             self.button_5.show()
 
-        self.screen_1.hide()
-        self.screen_2.hide()
-        self.screen_3.hide()
-        self.screen_5.hide()
-        self.screen_6.hide()
-        self.screen_4.show()
-        self.setStyleSheet("background-color:rgb(250,250,250);")
         self.configlist.hide()
         self.label_29.setText("")
         self.label_30.setText("")
@@ -331,54 +408,39 @@ class MainWindow(QtWidgets.QMainWindow):
         
 
     def init_screen_5(self):
-        self.screen = 5
+        self.show_screen(5)
+        self.load_acquisition_modules()
+        self.start_camera()
         
         self.label_A.setText("Auto Operation")
-        self.screen_1.hide()
-        self.screen_2.hide()
-        self.screen_3.hide()
-        self.screen_4.hide()
-        self.screen_6.hide()
-        self.screen_5.show()
-        self.setStyleSheet("background-color:rgb(250,250,250);")
         # shadow1=QGraphicsDropShadowEffect()
         # shadow1.setBlurRadius(30)
         # shadow1.setOffset(0,5)
         # self.button_7.setGraphicsEffect(shadow1)
 
 
+    def setup_screen_6(self):
+        for button in (self.button_13, self.button_14, self.button_15, self.button_16, self.button_17):
+            button.setStyleSheet("background-color:transparent;")
+        for button in (self.button_13, self.button_14, self.button_15, self.button_16, self.button_17,
+                       self.button_18):
+            button.setIconSize(QSize(100, 100))
+
     def init_screen_6(self):
-        self.screen = 6
+        self.show_screen(6)
+        self.load_acquisition_modules()
+        self.start_camera()
         self.label_A.setText("Manual Operation")
-        self.screen_1.hide()
-        self.screen_2.hide()
-        self.screen_3.hide()
-        self.screen_4.hide()
-        self.screen_5.hide()
-        self.screen_6.show()
-        self.button_13.setStyleSheet('background-color:transparent;')
-        self.button_13.setIcon(QIcon(base_path+"/rsc/cttm_left.png"))
-        self.button_13.setIconSize(QSize(100, 100)) 
-        self.button_14.setStyleSheet('background-color:transparent;')
-        self.button_14.setIcon(QIcon(base_path+"/rsc/cttm_right.png"))
-        self.button_14.setIconSize(QSize(100, 100)) 
-        self.button_15.setStyleSheet("background-color:transparent;")
-        self.button_15.setIcon(QIcon(base_path+"/rsc/cttm_heater.png"))
-        self.button_15.setIconSize(QSize(100, 100)) 
-        self.button_16.setStyleSheet("background-color:transparent;")
-        self.button_16.setIcon(QIcon(base_path+"/rsc/cttm_clamp.png"))
-        self.button_16.setIconSize(QSize(100, 100)) 
-        self.button_17.setStyleSheet("background-color:transparent;")
-        self.button_17.setIcon(QIcon(base_path+"/rsc/cttm_clamp.png"))
-        self.button_17.setIconSize(QSize(100, 100))       
-        self.button_18.setIcon(QIcon(base_path+"/rsc/cttm_reset.png"))
-        self.button_18.setIconSize(QSize(100, 100)) 
+        self.button_13.setIcon(self.resources.icon("cttm_left.png"))
+        self.button_14.setIcon(self.resources.icon("cttm_right.png"))
+        self.button_15.setIcon(self.resources.icon("cttm_heater.png"))
+        self.button_16.setIcon(self.resources.icon("cttm_clamp.png"))
+        self.button_17.setIcon(self.resources.icon("cttm_clamp.png"))
+        self.button_18.setIcon(self.resources.icon("cttm_reset.png"))
         self.label_10.setText("Clamp 2 OFF")
         self.label_7.setText("Clamp 1 OFF")
-        self.setStyleSheet("background-color:rgb(250,250,250);")
         print("screen 6")
-        self.timer.start()
-        self.timer2.start()
+        self.scheduler.start("camera")
         self.heater=False
         self.valve1=False
         self.valve2=False
@@ -404,6 +466,13 @@ class MainWindow(QtWidgets.QMainWindow):
                     self.keyboard.close()
                     print("Virtual keyboard closed")
 
+                self.stop_serial_worker()
+                self.stop_capture()
+                self.port_watcher.stop()
+                self.scheduler.stop_all()
+                self.finish_run()
+                self.stop_camera()
+
             except Exception as e:
                 print(f"Error turning off power supply or sending stop command to MCU: {e}")
 
@@ -417,13 +486,7 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             self.configlist.show()
             self.configlist.clear()
-            if os.path.exists('ConfigFile.csv'):
-                with open('ConfigFile.csv', 'r') as file:
-                    reader = csv.reader(file)
-                    next(reader, None) 
-                    for row in reader:
-                        if row: 
-                            self.configlist.addItem(row[0])  
+            self.configlist.addItems(self.configs.names())
             list_height = (self.configlist.count()*42) + 2
             if(list_height>350): list_height = 350
             self.configlist.setFixedHeight(list_height)
@@ -434,14 +497,9 @@ class MainWindow(QtWidgets.QMainWindow):
             selected_item = selected_items_list[0].text()
             print(f"Selected item text: {selected_item}")
 
-            if os.path.exists('ConfigFile.csv'):
-                with open('ConfigFile.csv', 'r') as file:
-                    reader = csv.reader(file)
-                    next(reader, None)
-                    for row in reader:
-                        if row[0] == selected_item:
-                            self.process_config = row
-                            break
+            config = self.configs.get(selected_item)
+            if config is not None:
+                self.process_config = config
             print("Process Config:", self.process_config)
             self.label_29.setText(self.process_config[0])
             self.label_30.setText(self.process_config[1])
@@ -484,25 +542,20 @@ class MainWindow(QtWidgets.QMainWindow):
             self.label_64.setStyleSheet("color:#FF0000;")
             return
         else:
-            file_exists = os.path.exists('ConfigFile.csv')
-            
-            if file_exists:
-                with open('ConfigFile.csv', 'r') as file:
-                    reader = csv.reader(file)
-                    next(reader, None)
-                    for row in reader:
-                        if self.input_13.text() == row[0]:  # Check if input_3 text exists in the first column
-                            self.label_64.setText("Error: Configuration Name already exists")
-                            self.label_64.setStyleSheet("color:#FF0000;")
-                            return
-                        
-            with open('ConfigFile.csv', 'a', newline='') as file:
-                writer = csv.writer(file)
-                if not file_exists:
-                    writer.writerow(['ConfigName', 'Linear Speed', 'Distance', 'Temperature', 'PeakForce'])  # Replace with appropriate header names
-                writer.writerow(data)
-                self.label_64.setText("Configuration has been saved successfully")
-                self.label_64.setStyleSheet("color:#009900;")
+            if data[0] in self.configs:
+                self.label_64.setText("Error: Configuration Name already exists")
+                self.label_64.setStyleSheet("color:#FF0000;")
+                return
+
+            try:
+                self.configs.add(data)
+            except ValueError:
+                # Another station saved the same name in the meantime
+                self.label_64.setText("Error: Configuration Name already exists")
+                self.label_64.setStyleSheet("color:#FF0000;")
+                return
+            self.label_64.setText("Configuration has been saved successfully")
+            self.label_64.setStyleSheet("color:#009900;")
 
     def handle_delete_configuration(self):
         self.init_screen_4(True)
@@ -511,44 +564,32 @@ class MainWindow(QtWidgets.QMainWindow):
         reply=QMessageBox.question(self, 'Confirm', 'Are you sure you want to delete this?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            if os.path.exists('ConfigFile.csv'):
-                with open('ConfigFile.csv', 'r') as file:
-                    reader = csv.reader(file)
-                    rows = list(reader)
-                with open('ConfigFile.csv', 'w', newline='') as file:
-                    writer = csv.writer(file)
-                    for row in rows:
-                        if row[0] != self.process_config[0]:
-                            print(self.process_config)
-                            writer.writerow(row)
-                            self.init_screen_2()
+            print(self.process_config)
+            if self.configs.delete(self.process_config[0]):
+                self.init_screen_2()
         else:
             print("Action canceled")
 
         print("delete pressed")
 
     def start_process(self):
-        self.timer.start(1)
+        self.scheduler.start("camera")
         if self.mode == "READY":
-            if self.feed_graph.layout() is None:
+            if self.live_plot is None:
+                from live_plot import LivePlot
                 print("Creating new layout")
-                self.fig, self.ax = plt.subplots(figsize=(4.25, 4.125), dpi=80)
-                self.canvas = FigureCanvas(self.fig)
-                layout = QVBoxLayout()
-                layout.addWidget(self.canvas)
-                self.feed_graph.setLayout(layout)
-
-            self.ax.set(xlabel='time (s)', ylabel='force (g)')
-            self.ax.grid()
-            self.line, = self.ax.plot([], [], color=(0,0.5,0.5))
-            self.canvas.draw() 
-            self.t = 1
+                self.live_plot = LivePlot(self.feed_graph)
+            else:
+                self.live_plot.reset()
+            self.run_start_ns = None
+            self.start_recording()
+            self.start_run_log()
+            self.start_break_detector()
         #self.mode = "PROCESSING"
         cmd=TX_START.format(self.label_30.text().zfill(3),self.label_31.text().zfill(3),self.label_32.text().zfill(3),self.label_33.text().zfill(3))
         #cmd = "*PS:"+ self.label_30.text().zfill(3) + ":" + self.label_31.text().zfill(3) +  ":" +self.label_32.text().zfill(3) +  ":" +self.label_33.text().zfill(3) + "#"
         print(cmd)
-        self.tx_data(cmd)
-        self.timer2.start()
+        self.tx_data(cmd, expect="PROCESSING")
          
     def pause_process(self):
         # self.timer.stop()
@@ -556,47 +597,152 @@ class MainWindow(QtWidgets.QMainWindow):
         cmd = TX_PAUSE.format( self.label_30.text().zfill(3), self.label_31.text().zfill(3),self.label_32.text().zfill(3),self.label_33.text().zfill(3))
         #cmd = "*PP:000:000:000:000#"
         print(cmd)
-        self.tx_data(cmd)
+        self.tx_data(cmd, expect="PAUSED")
 
     def reset_process(self):
-        self.timer.stop()
-        self.ax.clear()
-        self.canvas.draw()
-        self.time_data = []
-        self.force_data = []
+        self.scheduler.stop("camera")
+        self.finish_run()
+        if self.live_plot is not None:
+            self.live_plot.reset()
+        self.time_data.clear()
+        self.force_data.clear()
+        self.stamp_data.clear()
+        self.latency_data.clear()
+        self.rendered_samples = 0
         self.feed_cam.setPixmap(QPixmap())
         cmd =TX_RESET.format( self.label_30.text().zfill(3), self.label_31.text().zfill(3),self.label_32.text().zfill(3),self.label_33.text().zfill(3))
         print(cmd)
-        self.tx_data(cmd)
+        self.tx_data(cmd, expect="HOMING")
+
+    def start_camera(self):
+        if self.camera is None:
+            from camera import CameraWorker, FramePresenter
+            if self.frame_presenter is None:
+                self.frame_presenter = FramePresenter()
+            self.camera = CameraWorker(0)
+            self.camera_seq = 0
+            self.camera.start()
+
+    def stop_camera(self):
+        self.scheduler.stop("camera")
+        self.stop_recording()
+        if self.camera is not None:
+            self.camera.stop()
+            self.camera = None
+
+    def start_recording(self):
+        self.stop_recording()
+        if self.camera is None:
+            return
+        from recorder import VideoRecorder
+        os.makedirs(RECORDING_DIR, exist_ok=True)
+        path = os.path.join(RECORDING_DIR, datetime.now().strftime("run_%Y%m%d_%H%M%S.avi"))
+        self.recorder = VideoRecorder(path, fps=RECORDING_FPS)
+        self.recorder.start()
+        self.camera.recorder = self.recorder
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            if self.camera is not None:
+                self.camera.recorder = None
+            self.recorder.stop()
+            self.recorder = None
+
+    def start_run_log(self):
+        self.stop_run_log()
+        self.run_logger = RunLogger(new_run_log_path(), self.process_config, self.mode)
+        if self.serial_worker is not None:
+            self.serial_worker.run_logger = self.run_logger
+
+    def stop_run_log(self):
+        if self.run_logger is not None:
+            # The worker may still be inside log_messages; RunLogger.close handles that
+            if self.serial_worker is not None:
+                self.serial_worker.run_logger = None
+            self.run_logger.close()
+            self.run_logger = None
+
+    def start_break_detector(self):
+        self.break_detector = None
+        if AUTO_STOP_ON_BREAK and self.process_config:
+            stop_force = float(self.process_config[4]) if STOP_AT_PEAK_FORCE else None
+            self.break_detector = BreakDetector(format_process_command(TX_PAUSE, self.process_config),
+                                                stop_force=stop_force, mode=self.mode)
+        if self.serial_worker is not None:
+            self.serial_worker.break_detector = self.break_detector
+
+    def stop_break_detector(self):
+        if self.serial_worker is not None:
+            self.serial_worker.break_detector = None
+        self.break_detector = None
+
+    def handle_break_detected(self, detector):
+        print(f"Auto stop on {detector.reason} at {detector.trigger.value:g} g "
+              f"(peak {detector.peak_force:g} g), TX_PAUSE sent {detector.latency_ms:.2f} ms after receipt")
+
+    def finish_run(self):
+        self.report_latency()
+        self.stop_break_detector()
+        video_path = self.recorder.path if self.recorder is not None else None
+        run_logger = self.run_logger
+        self.stop_recording()
+        self.stop_run_log()
+        if run_logger is not None and run_logger.samples:
+            from analysis import analyze_run_log, format_analysis
+            print(format_analysis(analyze_run_log(run_logger.path)))
+        add_run = getattr(self.configs, "add_run", None)
+        if run_logger is not None and add_run is not None:
+            recipe_name = self.process_config[0] if self.process_config else ""
+            add_run(recipe_name, run_logger.started, datetime.now().isoformat(timespec='seconds'),
+                    run_logger.samples, run_logger.peak_force, run_logger.path, video_path)
 
     def display_cam(self):
-        ret, frame = self.camera.read()
-        if ret:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            q_img = QImage(frame.data, 640, 480, 1920, QImage.Format_RGB888)
-            if self.screen == 5:
-                self.feed_cam.setPixmap(QPixmap.fromImage(q_img))
-            elif self.screen == 6:
-                self.feed_cam_2.setPixmap(QPixmap.fromImage(q_img))
+        # Pulls the newest captured frame; never waits on the device
+        if self.camera is None:
+            return
+        if self.screen == 5:
+            label = self.feed_cam
+        elif self.screen == 6:
+            label = self.feed_cam_2
         else:
-            self.feed_cam.setText("Failed to load Camera!")
-            self.feed_cam_2.setText("Failed to load Camera!")
+            return
+        seq, frame, _ = self.camera.latest()
+        if seq != self.camera_seq and frame is not None:
+            self.camera_seq = seq
+            self.frame_presenter.present(frame, label)
+        elif self.camera.failed:
+            label.setText("Failed to load Camera!")
+
+    def record_sample(self, message):
+        if self.run_start_ns is None:
+            self.run_start_ns = message.t_ns
+        self.time_data.append((message.t_ns - self.run_start_ns) / 1e9)
+        self.force_data.append(message.value)
+        self.stamp_data.append(message.t_ns)
+        self.plot_dirty = True
 
     def display_plot(self):
-        self.t = self.t + 1
-        self.label_36.setText(str(self.rx_force))
-        self.label_37.setText(str(self.rx_temperature))
-        self.time_data.append(self.t)
-        self.force_data.append(self.rx_force)
-        if len(self.time_data) > 25:
-            t_data = self.time_data[-25:]
-            f_data = self.force_data[-25:]        
-            self.line.set_data(t_data, f_data)
-        else:
-            self.line.set_data(self.time_data, self.force_data)
-        self.ax.relim()
-        self.ax.autoscale_view()
-        self.canvas.draw()
+        # Runs from the scheduler; redraws only when new samples arrived
+        if not self.plot_dirty or self.live_plot is None:
+            return
+        self.plot_dirty = False
+        self.live_plot.update(self.time_data.window(PLOT_WINDOW), self.force_data.window(PLOT_WINDOW))
+        self.record_render_latency()
+
+    def record_render_latency(self):
+        total = self.stamp_data.total
+        new = total - self.rendered_samples
+        self.rendered_samples = total
+        if new > 0:
+            now = time.monotonic_ns()
+            self.latency_data.extend((now - self.stamp_data.window(new)) / 1e6)
+
+    def report_latency(self):
+        latencies = self.latency_data.window()
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"Receive-to-render latency over last {len(latencies)} samples: "
+                  f"p50 {p50:.1f} ms, p99 {p99:.1f} ms, max {latencies.max():.1f} ms")
         
     def handle_back_pressed(self):
         self.button_A.setIconSize(QSize(40, 40))
@@ -617,45 +763,78 @@ class MainWindow(QtWidgets.QMainWindow):
     def handle_app_quit(self):
         self.close()
      
-    def rx_data(self):
-        try:
-            if self.ser and self.ser.in_waiting > 0:
-                my_data = self.read_until_delimiter()
-                print("Data received:", my_data)
-                ## condition to check formating of data i.e. data[0]=='*'
-                #if data is TEMP
-                if my_data[1:5]==RX_TEMPERATURE[1:5]:
-                    self.rx_temperature = int(my_data[5:len(my_data)-1])
-                #if data is FORCE
-                elif my_data[1:5]==RX_FORCE[1:5]:
-                    self.rx_force=(int(my_data[5:len(my_data)-1]))/100
-                #if data is MODE
-                elif my_data[0:5]==RX_MODE:
-                    if my_data==RX_READY:
-                        self.mode="READY"
-                    elif my_data==RX_START:
-                        self.mode="PROCESSING"
-                    elif my_data==RX_PAUSE:
-                        self.mode="PAUSED"
-                    elif my_data==RX_RESET:
-                        self.mode="HOMING"
-                self.label_38.setText(self.mode)
-                self.label_37.setText(str(self.rx_temperature))
-                self.label_47.setText(str(self.rx_temperature))
-                self.label_41.setText(str(self.rx_force))
-                self.label_46.setText(str(self.rx_force))
-
-
-            self.handle_screen5()
-        except serial.SerialException as e:
-            print(f"SerialException: {e}")    
-        # save function here
-
-    def tx_data(self,data):
-        try:
-            self.ser.write(data.encode())
-        except Exception as err:
-             self.label_9.setText("ERROR: NO SERIAL PORT")
+    def rx_messages(self, messages):
+        # Slot for SerialWorker.messages_received, always runs on the GUI thread
+        for message in messages:
+            self.rx_data(message)
+
+    def rx_data(self, message):
+        #if data is TEMP
+        if type(message) is TemperatureMsg:
+            self.rx_temperature = message.value
+        #if data is FORCE
+        elif type(message) is ForceMsg:
+            self.rx_force = message.value
+            if self.mode == "PROCESSING":
+                self.record_sample(message)
+        #if data is MODE
+        elif type(message) is ModeMsg:
+            if message.mode != self.mode:
+                self.mode = message.mode
+                self.handle_screen5()
+        self.labels_dirty = True
+
+    def refresh_labels(self):
+        # Runs from the scheduler; label text is only touched when values changed
+        if not self.labels_dirty:
+            return
+        self.labels_dirty = False
+        self.label_38.setText(self.mode)
+        self.label_36.setText(str(self.rx_force))
+        self.label_37.setText(str(self.rx_temperature))
+        self.label_47.setText(str(self.rx_temperature))
+        self.label_41.setText(str(self.rx_force))
+        self.label_46.setText(str(self.rx_force))
+
+    def handle_serial_error(self, message):
+        print(f"SerialException: {message}")
+        self.label_9.setText("ERROR: SERIAL PORT LOST")
+        self.stop_serial_worker()
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except (serial.SerialException, OSError):
+                pass
+            self.ser = None
+        if self.port_identity is not None:
+            self.port_watcher.reconnect(self.port_identity)
+
+    def handle_serial_reconnected(self, ser, device, downtime):
+        if self.ser is not None or self.port_identity is None:
+            # Another port was picked while this one was being reopened
+            ser.close()
+            return
+        print(f"Reconnected to {device} after {downtime * 1000:.0f} ms")
+        self.stop_serial_worker()
+        self.ser = ser
+        self.port_device = device
+        self.start_serial_worker()
+        self.select_comport(device)
+        self.label_9.setText(f"RECONNECTED AFTER {downtime:.1f} s")
+
+    def tx_data(self, data, expect=None, key=None):
+        # Queued, never blocks; expect is the mode the machine has to reply with
+        if self.command_queue is None:
+            self.label_9.setText(f"ERROR: {NO_SERIAL_PORT}")
+            return None
+        return self.command_queue.submit(data, expect=expect, key=key)
+
+    def handle_command_acked(self, data, rtt_ms):
+        print(f"{data} acknowledged in {rtt_ms:.1f} ms")
+
+    def handle_command_failed(self, data, reason):
+        print(f"{data} failed: {reason}")
+        self.label_9.setText(f"ERROR: {reason}")
                
     def handle_screen5(self):
         if self.mode == "READY":
@@ -668,7 +847,6 @@ class MainWindow(QtWidgets.QMainWindow):
             self.button_8.setEnabled(True)
             self.button_9.setEnabled(False)
             self.button_A.setEnabled(False)
-            self.display_plot()
         elif self.mode == "PAUSED":
             self.button_7.setEnabled(True)
             self.button_8.setEnabled(False)
@@ -681,30 +859,95 @@ class MainWindow(QtWidgets.QMainWindow):
             self.button_A.setEnabled(False)
 
     def load_comlist(self):
-        self.comboBox.clear()
-        com_ports_list = []
-        com_ports = serial.tools.list_ports.comports()
-        for port in com_ports:
-            self.comboBox.addItem(f"{port.device}")
+        # The port watcher keeps the list current; opening the dropdown never scans
+        self.update_comlist(self.port_watcher.ports)
         self.showPopup2()
 
-    def read_until_delimiter(self):
-        data = bytearray()
-        delimiter=b'#'
-        while True:
-            if self.ser.in_waiting > 0:  # Check if there's data waiting in the buffer
-                byte = self.ser.read(1)  # Read one byte at a time
-                data.extend(byte)
-                if byte == delimiter:
-                    break
-        return data.decode('utf-8')
+    def update_comlist(self, ports):
+        if ports == [self.comboBox.itemText(i) for i in range(self.comboBox.count())]:
+            return
+        current = self.comboBox.currentText()
+        self.comboBox.blockSignals(True)
+        self.comboBox.clear()
+        self.comboBox.addItems(ports)
+        self.comboBox.blockSignals(False)
+        self.select_comport(current)
+
+    def select_comport(self, device):
+        index = self.comboBox.findText(device)
+        if index > -1:
+            self.comboBox.blockSignals(True)
+            self.comboBox.setCurrentIndex(index)
+            self.comboBox.blockSignals(False)
 
     def set_serial(self):
+        self.port_watcher.cancel_reconnect()
+        self.stop_serial_worker()
         if self.ser != None:
             self.ser.close() 
+            self.ser = None
+        self.port_device = None
+        self.port_identity = None
         if self.comboBox.currentIndex() > -1:
             comPort= self.comboBox.currentText()
-            self.ser = serial.Serial(comPort, baudrate=115200, timeout=1)
+            try:
+                self.ser = serial.Serial(comPort, **SERIAL_OPTIONS)
+            except serial.SerialException as e:
+                print(f"SerialException: {e}")
+                self.label_9.setText("ERROR: CANNOT OPEN SERIAL PORT")
+                return
+            self.port_device = comPort
+            # Taken now: once the adapter is unplugged the next scan forgets it
+            self.port_identity = self.port_watcher.identity(comPort)
+            self.start_serial_worker()
+
+    def start_serial_worker(self):
+        self.command_queue = CommandQueue(self.ser)
+        self.command_queue.command_acked.connect(self.handle_command_acked, Qt.QueuedConnection)
+        self.command_queue.command_failed.connect(self.handle_command_failed, Qt.QueuedConnection)
+        self.command_queue.start()
+        self.serial_worker = SerialWorker(self.ser)
+        self.serial_worker.run_logger = self.run_logger
+        self.serial_worker.command_queue = self.command_queue
+        self.serial_worker.break_detector = self.break_detector
+        if CAPTURE_SERIAL and self.capture is None and not isinstance(self.ser, ReplayPort):
+            self.capture = SerialCapture(new_capture_path(CAPTURE_DIR), getattr(self.ser, 'port', None))
+            print(f"Capturing serial data to {self.capture.path}")
+        self.serial_worker.capture = self.capture
+        self.serial_worker.break_detected.connect(self.handle_break_detected, Qt.QueuedConnection)
+        self.serial_worker.messages_received.connect(self.rx_messages, Qt.QueuedConnection)
+        self.serial_worker.serial_error.connect(self.handle_serial_error, Qt.QueuedConnection)
+        self.serial_worker.start()
+
+    def stop_serial_worker(self):
+        if self.serial_worker is not None:
+            self.serial_worker.stop()
+            self.serial_worker = None
+        if self.command_queue is not None:
+            self.command_queue.stop()
+            self.command_queue = None
+
+    def stop_capture(self):
+        if self.capture is not None:
+            self.capture.close()
+            print(f"Capture saved to {self.capture.path}: {self.capture.bytes} bytes")
+            self.capture = None
+
+    def start_replay(self, path, speed=1.0):
+        # Feeds a capture through the same worker, decoder and screens as a port
+        self.port_watcher.cancel_reconnect()
+        self.stop_serial_worker()
+        if self.ser is not None:
+            self.ser.close()
+        self.port_device = None
+        self.port_identity = None
+        self.init_screen_5()
+        # The replay starts with TX_START, once start_process has set up the run
+        self.ser = ReplayPort.open(path, speed, start_on_write=True)
+        print(f"Replaying {path} at {f'{speed:g}x' if speed > 0 else 'max speed'}")
+        self.start_serial_worker()
+        self.start_process()
+        self.label_9.setText(f"REPLAY {os.path.basename(path)}")
             
     def handle_manual(self):
         print("on screen 6")
@@ -721,16 +964,14 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def motor_left_pressed(self):
         print("motor pressed")
-        self.button_13.setStyleSheet('background-color:transparent;')
-        self.button_13.setIcon(QIcon(base_path+"/rsc/cttm_left_pressed.png"))
-        self.tx_data(TX_MOTOR_BACKWARD_START)
+        self.button_13.setIcon(self.resources.icon("cttm_left_pressed.png"))
+        self.tx_data(TX_MOTOR_BACKWARD_START, key="motor_left")
 
     def motor_left_released(self):
         print("motor released")
-        self.button_13.setStyleSheet("background-color:transparent;")
-        self.button_13.setIcon(QIcon(base_path+"/rsc/cttm_left.png"))
+        self.button_13.setIcon(self.resources.icon("cttm_left.png"))
 
-        self.tx_data(TX_MOTOR_BACKWARD_STOP)
+        self.tx_data(TX_MOTOR_BACKWARD_STOP, key="motor_left")
 
     
     def handle_motor_right(self):
@@ -743,29 +984,25 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def motor_right_pressed(self):
         print("motor pressed")
-        self.button_14.setStyleSheet("background-color:transparent;")
-        self.button_14.setIcon(QIcon(base_path+"/rsc/cttm_right_pressed.png"))
+        self.button_14.setIcon(self.resources.icon("cttm_right_pressed.png"))
 
-        self.tx_data(TX_MOTOR_FORWARD_START)
+        self.tx_data(TX_MOTOR_FORWARD_START, key="motor_right")
 
     def motor_right_released(self):
         print("motor released")
-        self.button_14.setStyleSheet("background-color:transparent;")
-        self.button_14.setIcon(QIcon(base_path+"/rsc/cttm_right.png"))
-        self.tx_data(TX_MOTOR_FORWARD_STOP)
+        self.button_14.setIcon(self.resources.icon("cttm_right.png"))
+        self.tx_data(TX_MOTOR_FORWARD_STOP, key="motor_right")
 
     def handle_heater(self):
         self.heater= not self.heater
         if(self.heater): 
             #heater on 
-            self.button_15.setStyleSheet("background-color:transparent;")
-            self.button_15.setIcon(QIcon(base_path+"/rsc/cttm_heater_pressed.png"))
-            self.tx_data(TX_HEATER_START)
+            self.button_15.setIcon(self.resources.icon("cttm_heater_pressed.png"))
+            self.tx_data(TX_HEATER_START, key="heater")
         else: 
             #heater off
-            self.tx_data(TX_HEATER_STOP)
-            self.button_15.setStyleSheet("background-color:transparent;")
-            self.button_15.setIcon(QIcon(base_path+"/rsc/cttm_heater.png"))
+            self.tx_data(TX_HEATER_STOP, key="heater")
+            self.button_15.setIcon(self.resources.icon("cttm_heater.png"))
 
         print("heater")
 
@@ -775,16 +1012,14 @@ class MainWindow(QtWidgets.QMainWindow):
             #valve on
             print("value 1 ON") 
             self.label_7.setText("Clamp 1 ON")
-            self.button_16.setStyleSheet("background-color:transparent;")
-            self.button_16.setIcon(QIcon(base_path+"/rsc/cttm_clamp_pressed.png"))
-            self.tx_data(TX_VALVE1_OPEN)
+            self.button_16.setIcon(self.resources.icon("cttm_clamp_pressed.png"))
+            self.tx_data(TX_VALVE1_OPEN, key="valve1")
         else:
             # valve off
             print("value 1 OFF")
             self.label_7.setText("Clamp 1 OFF")
-            self.button_16.setStyleSheet("background-color:transparent;")
-            self.button_16.setIcon(QIcon(base_path+"/rsc/cttm_clamp.png"))
-            self.tx_data(TX_VALVE1_CLOSE)
+            self.button_16.setIcon(self.resources.icon("cttm_clamp.png"))
+            self.tx_data(TX_VALVE1_CLOSE, key="valve1")
 
     def handle_valve_2(self):
         print("hello from handle_valve_2")
@@ -793,32 +1028,32 @@ class MainWindow(QtWidgets.QMainWindow):
             #valve on
             print("value 2 ON")
             self.label_10.setText("Clamp 2 ON")
-            self.button_17.setStyleSheet("background-color:transparent;")
-            self.button_17.setIcon(QIcon(base_path+"/rsc/cttm_clamp_pressed.png"))
-            self.tx_data(TX_VALVE1_OPEN)
+            self.button_17.setIcon(self.resources.icon("cttm_clamp_pressed.png"))
+            self.tx_data(TX_VALVE1_OPEN, key="valve2")
         else:
             # valve off
             print("value 2 OFF")
             self.label_10.setText("Clamp 2 OFF")
-            self.button_17.setStyleSheet("background-color:transparent;")
-            self.button_17.setIcon(QIcon(base_path+"/rsc/cttm_clamp.png"))
+            self.button_17.setIcon(self.resources.icon("cttm_clamp.png"))
 
-            self.tx_data(TX_VALVE2_CLOSE)
+            self.tx_data(TX_VALVE2_CLOSE, key="valve2")
     
     def handle_reset_pressed(self):
         print("pressed")
-        self.button_18.setIcon(QIcon(base_path+"/rsc/cttm_reset_pressed.png"))
+        self.button_18.setIcon(self.resources.icon("cttm_reset_pressed.png"))
         cmd =TX_RESET.format( self.label_30.text().zfill(3), self.label_31.text().zfill(3),self.label_32.text().zfill(3),self.label_33.text().zfill(3))
         print(cmd)
-        self.tx_data(cmd)
+        self.tx_data(cmd, expect="HOMING")
 
     def handle_reset_released(self):
         print("released")
-        self.button_18.setIcon(QIcon(base_path+"/rsc/cttm_reset.png"))
+        self.button_18.setIcon(self.resources.icon("cttm_reset.png"))
 
 
 def main():
+    startup.mark("imports")
     app = QtWidgets.QApplication(sys.argv)
+    startup.mark("QApplication")
     window = MainWindow()
     # window.showFullScreen()
     window.show()
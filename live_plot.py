@@ -0,0 +1,80 @@
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import QVBoxLayout
+
+X_HEADROOM = 0.5    # fraction of the visible span added ahead of the newest sample
+Y_MARGIN = 0.1      # fraction of the data range added above and below
+Y_HEADROOM = 0.1    # fraction of the force level, so a rising curve does not refit every sample
+
+
+class LivePlot:
+    """Live line plot that blits the line artist over a cached background.
+
+    A full canvas render only happens when the axes limits have to change
+    (data left the current bounds) or the widget was resized; every other
+    update restores the cached background and redraws the single line.
+    The caller sets the frame rate; RefreshScheduler runs display_plot at
+    PLOT_FPS.
+    """
+
+    def __init__(self, container, figsize=(4.25, 4.125), dpi=80,
+                 xlabel='time (s)', ylabel='force (g)', color=(0, 0.5, 0.5)):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvas(self.figure)
+        layout = QVBoxLayout()
+        layout.addWidget(self.canvas)
+        container.setLayout(layout)
+
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.color = color
+        self.line = None
+        self._background = None
+        self.full_draws = 0
+        self.blits = 0
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.reset()
+
+    def reset(self):
+        self.ax.clear()
+        self.ax.set(xlabel=self.xlabel, ylabel=self.ylabel)
+        self.ax.grid()
+        self.line, = self.ax.plot([], [], color=self.color, animated=True)
+        self._background = None
+        self.canvas.draw()
+
+    def update(self, x, y):
+        """Show the given series."""
+        self.line.set_data(x, y)
+        if len(x) and self._out_of_bounds(x, y):
+            self._rescale(x, y)
+            self._background = None
+        if self._background is None:
+            # draw_event re-caches the background and draws the line on top
+            self.canvas.draw()
+            self.full_draws += 1
+        else:
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self.line)
+            self.canvas.blit(self.ax.bbox)
+            self.blits += 1
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.ax.draw_artist(self.line)
+
+    def _out_of_bounds(self, x, y):
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        return x[0] < x0 or x[-1] > x1 or np.min(y) < y0 or np.max(y) > y1
+
+    def _rescale(self, x, y):
+        x0 = float(x[0])
+        span = max(float(x[-1]) - x0, 1.0)
+        self.ax.set_xlim(x0, x0 + span * (1 + X_HEADROOM))
+        y0 = float(np.min(y))
+        y1 = float(np.max(y))
+        pad = max((y1 - y0) * Y_MARGIN, max(abs(y0), abs(y1)) * Y_HEADROOM, 1.0)
+        self.ax.set_ylim(y0 - pad, y1 + pad)
@@ -1,19 +1,45 @@
 import sys
 
 from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QIntValidator
 from PyQt5.QtWidgets import (QApplication, QDialog, QGridLayout, QHBoxLayout,
-                             QLineEdit, QMainWindow, QPushButton, QVBoxLayout,
-                             QWidget)
+                             QLineEdit, QMainWindow, QPushButton, QStackedWidget,
+                             QVBoxLayout, QWidget)
+
+
+# Text keys of the full keyboard, in rows of ten; letters are shown in upper case
+KEYS = [
+    '1', '2', '3', '4', '5', '6', '7', '8', '9', '0',
+    'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P',
+    'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L',
+    'Z', 'X', 'C', 'V', 'B', 'N', 'M', '<-', 'Space',
+]
+# Keypad for fields with a QIntValidator, in rows of three
+NUMERIC_KEYS = [
+    '7', '8', '9',
+    '4', '5', '6',
+    '1', '2', '3',
+    '0', '<-',
+]
 
 
 class VirtualKeyboard(QDialog):
+    """On-screen keyboard that is built once and retargeted between input fields.
+
+    Both the full layout and a numeric keypad are created up front;
+    set_target() picks the keypad for fields with a QIntValidator. Caps Lock
+    relabels the letter keys in place instead of rebuilding them.
+    """
+
     def __init__(self, input_field, main_window):
         super().__init__()
-        self.input_field = input_field
+        self.input_field = None
         self.main_window = main_window
         # Flag to check if Caps Lock is on (start with uppercase)
         self.is_caps = True
+        self.letter_buttons = []
         self.initUI()
+        self.set_target(input_field)
 
     def initUI(self):
         self.setWindowTitle("Virtual Keyboard")
@@ -23,53 +49,60 @@ class VirtualKeyboard(QDialog):
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
 
-        # Define the keyboard layout (below the close button)
-        self.keyboard_layout = QGridLayout()
-        main_layout.addLayout(self.keyboard_layout)
+        # Full keyboard and numeric keypad as two pages
+        self.pages = QStackedWidget()
+        main_layout.addWidget(self.pages)
+        self.keyboard_page = QWidget()
+        self.keyboard_layout = QGridLayout(self.keyboard_page)
+        self.numeric_page = QWidget()
+        self.numeric_layout = QGridLayout(self.numeric_page)
+        self.pages.addWidget(self.keyboard_page)
+        self.pages.addWidget(self.numeric_page)
 
         self.create_keys()
 
     def create_keys(self):
-        # Clear layout if necessary (for toggling between cases)
-        while self.keyboard_layout.count():
-            child = self.keyboard_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Define the keys, initially in uppercase
-        keys = [
-            '1', '2', '3', '4', '5', '6', '7', '8', '9', '0',
-            'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P',
-            'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L',
-            'Z', 'X', 'C', 'V', 'B', 'N', 'M', '<-', 'Space',
-        ]
-
-        if not self.is_caps:
-            keys = [key.lower() if key.isalpha() else key for key in keys]
+        row, col = self.add_keys(self.keyboard_layout, KEYS, 10)
+        # Add Caps Lock buton
+        caps_button = QPushButton("Caps Lock")
+        caps_button.clicked.connect(self.toggle_caps_lock)
+        self.keyboard_layout.addWidget(caps_button, row, col)
+        self.add_keys(self.numeric_layout, NUMERIC_KEYS, 3)
 
+    def add_keys(self, layout, keys, columns):
         row = 0
         col = 0
         for key in keys:
             button = QPushButton(key)
-            button.clicked.connect(lambda _, k=key: self.key_clicked(k))
-            self.keyboard_layout.addWidget(button, row, col)
+            if key.isalpha() and len(key) == 1:
+                # Letters send their current label, so Caps Lock only has to relabel them
+                button.clicked.connect(lambda _, b=button: self.key_clicked(b.text()))
+                self.letter_buttons.append(button)
+            else:
+                button.clicked.connect(lambda _, k=key: self.key_clicked(k))
+            layout.addWidget(button, row, col)
 
             col += 1
-            if col > 9:
+            if col >= columns:
                 col = 0
                 row += 1
+        return row, col
 
-        # Add Caps Lock buton
-        caps_button = QPushButton("Caps Lock")
-        caps_button.clicked.connect(self.toggle_caps_lock)
-        self.keyboard_layout.addWidget(caps_button, row, col)
+    def set_target(self, input_field):
+        """Type into input_field from now on; integer fields get the numeric keypad."""
+        self.input_field = input_field
+        numeric = input_field is not None and isinstance(input_field.validator(), QIntValidator)
+        self.pages.setCurrentWidget(self.numeric_page if numeric else self.keyboard_page)
 
     def toggle_caps_lock(self):
         # Toggle Caps Lock state
         self.is_caps = not self.is_caps
-        self.create_keys()  # Recreate the keyboard with the updated case
+        for button in self.letter_buttons:
+            button.setText(button.text().upper() if self.is_caps else button.text().lower())
 
     def key_clicked(self, key):
+        if self.input_field is None:
+            return
         if key == '<-':
             current_text = self.input_field.text()
             self.input_field.setText(current_text[:-1])
@@ -108,19 +141,22 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
 
-        # Flag to track if the keyboard is open
+        # Flag to track if the keyboard is open; the keyboard itself is kept
         self.keyboard_open = False
+        self.keyboard = None
 
         # Connect focus event to show virtual keyboard
         self.input_field.focusInEvent = self.show_virtual_keyboard
 
     def show_virtual_keyboard(self, event):
-        if not self.keyboard_open:
+        if self.keyboard is None:
             self.keyboard = VirtualKeyboard(self.input_field, self)
-            self.keyboard.show()
-            self.keyboard_open = True  # Set flag when the keyboard opens
             # Connect to track when the keyboard is closed
             self.keyboard.finished.connect(self.on_keyboard_closed)
+        if not self.keyboard_open:
+            self.keyboard.set_target(self.input_field)
+            self.keyboard.show()
+            self.keyboard_open = True  # Set flag when the keyboard opens
         QLineEdit.focusInEvent(self.input_field, event)
 
     def on_keyboard_closed(self):
@@ -0,0 +1,297 @@
+"""Drive several CTTM testers concurrently from one process.
+
+    python multi_machine.py --port /dev/ttyUSB0 --port /dev/ttyUSB1 --config config1
+
+Each MachineSession owns one serial port, its own READY/PROCESSING/PAUSED/
+HOMING state and its own sample buffers and run log. MultiMachineController
+runs each session's blocking read loop on a thread pool. The reads release
+the GIL, so throughput grows with the number of ports. Without --config the
+sessions are only monitored; with it, the recipe is run on every machine at
+once through cttm_cli.run_test, and each machine gets its own verdict from
+its run log, as cttm_cli gives it.
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import serial
+
+from config_store import ConfigRepository, CONFIG_FILE
+from cttm_cli import read_messages, run_test, report_verdict, EXIT_PASS, EXIT_ERROR
+from protocol import FrameDecoder, ForceMsg, TemperatureMsg, ModeMsg, TX_PAUSE, format_process_command
+from ring_buffer import RingBuffer
+from run_log import RunLogger, new_run_log_path, RUN_LOG_DIR
+
+SAMPLE_HISTORY = 4096
+DASHBOARD_INTERVAL = 1.0
+
+
+class SessionSnapshot(NamedTuple):
+    name: str
+    mode: str
+    force: float
+    temperature: int
+    peak_force: float
+    force_samples: int
+    frames: int
+    error: str
+
+
+class MachineSession:
+
+    def __init__(self, port, baudrate=115200, name=None, history=SAMPLE_HISTORY, log_dir=RUN_LOG_DIR):
+        self.port = port
+        self.baudrate = baudrate
+        self.name = name or port
+        self.log_dir = log_dir
+        self.ser = None
+        self.mode = "READY"
+        self.force = 0.0
+        self.temperature = 0
+        self.peak_force = 0.0
+        self.force_samples = 0
+        self.frames = 0
+        self.error = None
+        self.config = None
+        self.run_logger = None
+        self.log_path = None
+        self.run_start_ns = None
+        self.time_data = RingBuffer(history)
+        self.force_data = RingBuffer(history)
+        self.decoder = FrameDecoder()
+        self._state = threading.Condition()
+        self._running = False
+
+    def open(self):
+        self.ser = serial.Serial(self.port, baudrate=self.baudrate, timeout=0.1)
+
+    def stop(self):
+        self._running = False
+        # Wake anything blocked in wait_for; it returns False with this error
+        with self._state:
+            if self.error is None:
+                self.error = "stopped"
+            self._state.notify_all()
+
+    def close(self):
+        self.stop()
+        self.finish_run()
+        if self.ser is not None:
+            self.ser.close()
+
+    def run(self):
+        """Blocking read loop; run it on its own thread."""
+        self._running = True
+        ser = self.ser
+        try:
+            while self._running:
+                messages = read_messages(ser, self.decoder)
+                if messages:
+                    self._apply(messages)
+        except (serial.SerialException, OSError) as e:
+            if self._running:
+                with self._state:
+                    self.error = str(e)
+                    self._state.notify_all()
+        self._running = False
+
+    def _apply(self, messages):
+        run_logger = self.run_logger
+        if run_logger is not None:
+            run_logger.log_messages(messages)
+        with self._state:
+            mode = self.mode
+            for message in messages:
+                kind = type(message)
+                if kind is ForceMsg:
+                    self.force = message.value
+                    if mode == "PROCESSING":
+                        if self.run_start_ns is None:
+                            self.run_start_ns = message.t_ns
+                        self.time_data.append((message.t_ns - self.run_start_ns) / 1e9)
+                        self.force_data.append(message.value)
+                        self.force_samples += 1
+                        if message.value > self.peak_force:
+                            self.peak_force = message.value
+                elif kind is TemperatureMsg:
+                    self.temperature = message.value
+                elif kind is ModeMsg:
+                    mode = message.mode
+            self.frames += len(messages)
+            if mode != self.mode:
+                self.mode = mode
+                self._state.notify_all()
+
+    def send(self, template):
+        self.ser.write(format_process_command(template, self.config or [""] * 5).encode())
+
+    def start_run(self, config):
+        self.finish_run()
+        with self._state:
+            self.config = config
+            self.peak_force = 0.0
+            self.force_samples = 0
+            self.run_start_ns = None
+            self.time_data.clear()
+            self.force_data.clear()
+        self.run_logger = RunLogger(new_run_log_path(self.log_dir, self.name), config, self.mode)
+        self.log_path = self.run_logger.path
+
+    def finish_run(self):
+        run_logger, self.run_logger = self.run_logger, None
+        if run_logger is not None:
+            run_logger.close()
+        return run_logger
+
+    def wait_for(self, predicate, timeout):
+        """Wait until predicate(session) holds; False on timeout or port error."""
+        with self._state:
+            return self._state.wait_for(lambda: predicate(self) or self.error is not None, timeout) \
+                and self.error is None
+
+    def snapshot(self):
+        with self._state:
+            return SessionSnapshot(self.name, self.mode, self.force, self.temperature, self.peak_force,
+                                   self.force_samples, self.frames, self.error or "")
+
+
+class MultiMachineController:
+
+    def __init__(self, ports, **session_options):
+        self.sessions = [MachineSession(port, **session_options) for port in ports]
+        self._executor = None
+        self._futures = []
+
+    def start(self):
+        for session in self.sessions:
+            session.open()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sessions), thread_name_prefix='MachineSession')
+        self._futures = [self._executor.submit(session.run) for session in self.sessions]
+
+    def stop(self):
+        for session in self.sessions:
+            session.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for session in self.sessions:
+            session.close()
+
+    def snapshot(self):
+        return [session.snapshot() for session in self.sessions]
+
+    def run_recipe(self, config, start_timeout=10.0, max_duration=600.0, home_timeout=60.0):
+        """Run one recipe on every machine at once; returns {name: error or None}.
+
+        Each session's log is left at session.log_path for the verdict.
+        """
+        results = {}
+        threads = [threading.Thread(target=self._run_one, args=(session, config, start_timeout,
+                                                                 max_duration, home_timeout, results))
+                   for session in self.sessions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    @staticmethod
+    def _run_one(session, config, start_timeout, max_duration, home_timeout, results):
+        session.start_run(config)
+        try:
+            results[session.name] = run_test(session, start_timeout, max_duration, home_timeout)
+        finally:
+            session.finish_run()
+
+
+def print_dashboard(snapshots, elapsed, previous):
+    print(f"--- {elapsed:7.1f} s " + "-" * 62)
+    total_rate = 0.0
+    for snap in snapshots:
+        rate = (snap.frames - previous.get(snap.name, 0)) / DASHBOARD_INTERVAL
+        total_rate += rate
+        previous[snap.name] = snap.frames
+        print(f"{snap.name:<18} {snap.mode:<10} {snap.force:9.2f} g {snap.temperature:4d} C "
+              f"peak {snap.peak_force:9.2f} g {snap.force_samples:9d} samples {rate:9.0f} frames/s "
+              f"{snap.error}")
+    print(f"{'all':<18} {total_rate:>74.0f} frames/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', action='append', required=True, help='serial port; repeat for every tester')
+    parser.add_argument('--config', help='ConfigName to run on every tester; monitor only if omitted')
+    parser.add_argument('--config-file', default=CONFIG_FILE)
+    parser.add_argument('--log-dir', default=RUN_LOG_DIR)
+    parser.add_argument('--baudrate', type=int, default=115200)
+    parser.add_argument('--max-duration', type=float, default=600.0, help='seconds of PROCESSING before TX_PAUSE')
+    parser.add_argument('--duration', type=float, help='monitor mode: exit after this many seconds')
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.config:
+        config = ConfigRepository(args.config_file).get(args.config)
+        if config is None:
+            print(f"ERROR: configuration {args.config!r} not found in {args.config_file}", file=sys.stderr)
+            return EXIT_ERROR
+
+    controller = MultiMachineController(args.port, baudrate=args.baudrate, log_dir=args.log_dir)
+    try:
+        controller.start()
+    except serial.SerialException as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        controller.stop()
+        return EXIT_ERROR
+
+    results = {}
+    start = time.monotonic()
+    previous = {}
+    runner = None
+    # Set when the recipe has finished on every machine. Waiting on an Event
+    # survives Ctrl-C; an interrupted Thread.join can return early afterwards.
+    done = threading.Event()
+
+    def run_recipe():
+        try:
+            results.update(controller.run_recipe(config, max_duration=args.max_duration))
+        finally:
+            done.set()
+
+    if config is not None:
+        runner = threading.Thread(target=run_recipe)
+        runner.start()
+    try:
+        while True:
+            if runner is not None:
+                done.wait(DASHBOARD_INTERVAL)
+            else:
+                time.sleep(DASHBOARD_INTERVAL)
+            elapsed = time.monotonic() - start
+            print_dashboard(controller.snapshot(), elapsed, previous)
+            if done.is_set():
+                break
+            if runner is None and args.duration is not None and elapsed >= args.duration:
+                break
+    except KeyboardInterrupt:
+        for session in controller.sessions:
+            if session.mode == "PROCESSING":
+                session.send(TX_PAUSE)
+    finally:
+        controller.stop()
+        if runner is not None:
+            done.wait()
+
+    if config is None:
+        return 0
+    status = EXIT_PASS
+    for session in controller.sessions:
+        status = max(status, report_verdict(session.name, results.get(session.name, "interrupted"),
+                                            session.log_path))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
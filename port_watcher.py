@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+import serial
+import serial.tools.list_ports
+from PyQt5.QtCore import QThread, pyqtSignal
+
+SCAN_INTERVAL = 1.0             # seconds between port scans
+RECONNECT_BACKOFF = (0.1, 2.0)  # first and longest wait between reconnect attempts, seconds
+
+
+def port_identity(info):
+    """What identifies the same adapter after it re-enumerates, possibly under another name."""
+    if info.vid is not None:
+        if info.serial_number:
+            return ('usb', info.vid, info.pid, info.serial_number)
+        return ('usb', info.vid, info.pid)
+    return ('device', info.device)
+
+
+class PortWatcher(QThread):
+    """Scans the serial ports on its own thread, keeps the list cached and reopens a lost device.
+
+    ``ports`` is the cached list of device names; ``ports_changed`` is emitted
+    whenever it changes. After ``reconnect(identity)``, with the identity taken
+    when the port was opened, the watcher looks for the same adapter, by serial
+    number or VID:PID, with a backoff doubling up to
+    RECONNECT_BACKOFF[1], opens it and hands the open port over through
+    ``reconnected(ser, device, downtime_s)``.
+    """
+
+    ports_changed = pyqtSignal(list)
+    reconnected = pyqtSignal(object, str, float)
+
+    def __init__(self, extra_ports=(), serial_options=None, parent=None):
+        super().__init__(parent)
+        self.extra_ports = list(extra_ports)
+        self.serial_options = serial_options or {}
+        self.ports = []
+        self._identities = {}
+        self._target = None
+        self._lost_at = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        # Set before the thread starts so a stop() before run() sticks
+        self._running = True
+
+    def identity(self, device):
+        with self._lock:
+            return self._identities.get(device, ('device', device))
+
+    def refresh(self):
+        """Scan now on the calling thread; returns True if the port list changed."""
+        identities = {info.device: port_identity(info) for info in serial.tools.list_ports.comports()}
+        for device in self.extra_ports:
+            if os.path.exists(device):
+                identities.setdefault(device, ('device', device))
+        devices = list(identities)
+        with self._lock:
+            changed = devices != self.ports
+            self.ports = devices
+            self._identities = identities
+        return changed
+
+    def reconnect(self, identity, lost_at=None):
+        with self._lock:
+            self._target = identity
+            self._lost_at = time.monotonic() if lost_at is None else lost_at
+        print(f"Waiting for {identity} to come back")
+        self._wake.set()
+
+    def cancel_reconnect(self):
+        with self._lock:
+            self._target = None
+
+    @property
+    def reconnecting(self):
+        return self._target is not None
+
+    def run(self):
+        backoff = RECONNECT_BACKOFF[0]
+        while self._running:
+            if self.refresh():
+                self.ports_changed.emit(list(self.ports))
+            target = self._target
+            if target is not None and not self._try_reconnect(target):
+                delay = backoff
+                backoff = min(backoff * 2, RECONNECT_BACKOFF[1])
+            else:
+                delay = SCAN_INTERVAL
+                backoff = RECONNECT_BACKOFF[0]
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _try_reconnect(self, target):
+        with self._lock:
+            devices = [device for device, identity in self._identities.items() if identity == target]
+        for device in devices:
+            try:
+                ser = serial.Serial(device, **self.serial_options)
+            except (serial.SerialException, OSError) as e:
+                print(f"Reopening {device} failed: {e}")
+                continue
+            with self._lock:
+                if self._target != target:
+                    # Cancelled while the port was being opened
+                    ser.close()
+                    return True
+                self._target = None
+                downtime = time.monotonic() - self._lost_at
+            self.reconnected.emit(ser, device, downtime)
+            return True
+        return False
+
+    def stop(self):
+        self._running = False
+        self._target = None
+        self._wake.set()
+        self.wait()
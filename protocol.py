@@ -0,0 +1,126 @@
+"""CTTM machine protocol: frame constants and a streaming decoder for `*...#` frames."""
+import re
+from typing import NamedTuple
+
+#==============COMMUNICATION PROTOCOLS==============
+#--------------------AUTO PAGE----------------------
+ON_PROCESS_PAGE="*3:5#"
+RX_MODE="*PRS:"
+TX_START="*1:1:{}:{}:{}:{}#"        #sent from pc
+RX_START="*PRS:STR#"                #expected from machine
+TX_PAUSE="*1:2:{}:{}:{}:{}#"        #send from pc
+RX_PAUSE="*PRS:PUS#"                #expected from machine
+TX_RESET="*1:3 :{}:{}:{}:{}#"       #sent from pc
+RX_RESET="*PRS:HOM#"                #expected from machine
+RX_READY="*PRS:RED#"                #expected from machine when ready
+#----------------------VALUES----------------------
+RX_TEMPERATURE="*TEP:xxx#"
+RX_FORCE="*FRC:xxxxxx#"
+#--------------------MANUAL PAGE-------------------
+TX_MOTOR_FORWARD_START="*2:4:1:1#"
+TX_MOTOR_FORWARD_STOP="*2:4:2:1#"
+TX_MOTOR_BACKWARD_START="*2:4:1:2#"
+TX_MOTOR_BACKWARD_STOP="*2:4:2:2#"
+TX_VALVE1_OPEN="*2:5:2#"
+TX_VALVE1_CLOSE="*2:5:1#"
+TX_VALVE2_OPEN="*2:6:1#"
+TX_VALVE2_CLOSE="*2:6:2#"
+TX_HEATER_START="*2:7:1#"
+TX_HEATER_STOP="*2:7:2#"
+#=======================================================
+
+FORCE_SCALE = 100               # *FRC: carries hundredths of a gram
+MAX_FRAME_LENGTH = 32           # longest partial frame carried between chunks
+
+
+def format_process_command(template, config):
+    """Fill TX_START/TX_PAUSE/TX_RESET from a recipe row, as start_process does."""
+    return template.format(*(str(field).zfill(3) for field in config[1:5]))
+
+
+# Decoded messages; t_ns is time.monotonic_ns() when the frame's bytes were received
+class TemperatureMsg(NamedTuple):
+    value: int
+    t_ns: int = 0
+
+
+class ForceMsg(NamedTuple):
+    value: float
+    t_ns: int = 0
+
+
+class ModeMsg(NamedTuple):
+    mode: str
+    t_ns: int = 0
+
+
+def _tag(frame):
+    return frame[1:4].encode()
+
+
+def _payload(frame):
+    return frame[5:-1].encode()
+
+
+_TEMPERATURE_TAG = _tag(RX_TEMPERATURE)
+_FORCE_TAG = _tag(RX_FORCE)
+_MODE_TAG = _tag(RX_MODE)
+_MODES = {
+    _payload(RX_READY): "READY",
+    _payload(RX_START): "PROCESSING",
+    _payload(RX_PAUSE): "PAUSED",
+    _payload(RX_RESET): "HOMING",
+}
+# A well formed frame never contains another '*' or '#', so anything the
+# pattern skips over between matches is line noise and is dropped (resync).
+_FRAME_RE = re.compile(rb'\*(%s|%s|%s):([^*#]{1,16})#' % (_TEMPERATURE_TAG, _FORCE_TAG, _MODE_TAG))
+
+
+class FrameDecoder:
+    """Incremental decoder: feed raw byte chunks, get typed messages back.
+
+    Complete frames are matched in place on the internal buffer; only a
+    trailing partial frame survives to the next call. Every message is
+    stamped with the receipt time passed in with the chunk that completed it.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.frames = 0
+        self.rejected = 0
+
+    def reset(self):
+        self._buffer.clear()
+
+    def feed(self, chunk, t_ns=0):
+        buffer = self._buffer
+        buffer += chunk
+        last = buffer.rfind(b'#')
+        if last < 0:
+            self._trim_partial(0)
+            return []
+
+        messages = []
+        append = messages.append
+        modes = _MODES
+        for tag, payload in _FRAME_RE.findall(buffer, 0, last + 1):
+            try:
+                if tag == _FORCE_TAG:
+                    append(ForceMsg(int(payload) / FORCE_SCALE, t_ns))
+                elif tag == _TEMPERATURE_TAG:
+                    append(TemperatureMsg(int(payload), t_ns))
+                else:
+                    append(ModeMsg(modes[payload], t_ns))
+            except (ValueError, KeyError):
+                self.rejected += 1
+        self.frames += len(messages)
+        self._trim_partial(last + 1)
+        return messages
+
+    def _trim_partial(self, consumed):
+        buffer = self._buffer
+        start = buffer.rfind(b'*', consumed)
+        if start < 0 or len(buffer) - start > MAX_FRAME_LENGTH:
+            buffer.clear()
+        else:
+            del buffer[:start]
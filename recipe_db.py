@@ -0,0 +1,141 @@
+"""SQLite store for process recipes and completed runs.
+
+Drop-in alternative to config_store.ConfigRepository (same names/get/add/
+delete interface) that can also keep run history. The database runs in WAL
+mode with a busy timeout, so several stations or processes can write to a
+shared file without corrupting it.
+"""
+import csv
+import os
+import sqlite3
+from datetime import datetime
+
+from config_store import CONFIG_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    linear_speed TEXT NOT NULL,
+    distance TEXT NOT NULL,
+    temperature TEXT NOT NULL,
+    peak_force TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    recipe_name TEXT NOT NULL,
+    started TEXT NOT NULL,
+    finished TEXT,
+    samples INTEGER,
+    peak_force REAL,
+    log_path TEXT,
+    video_path TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_recipe_started ON runs (recipe_name, started);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+"""
+RECIPE_COLUMNS = "name, linear_speed, distance, temperature, peak_force"
+BUSY_TIMEOUT_MS = 5000
+
+
+class SqliteConfigRepository:
+    """Process recipes and run history in one SQLite database.
+
+    Recipes are looked up by name, like ConfigRepository. On first use the
+    rows of ``import_csv`` are copied in once; the import is recorded in
+    the meta table so later opens, from any station, skip it. add_run and
+    runs keep the history of completed runs with their log and video paths.
+    """
+
+    def __init__(self, path, import_csv=CONFIG_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        if import_csv:
+            self.import_csv(import_csv)
+
+    def close(self):
+        self.conn.close()
+
+    def import_csv(self, csv_path, force=False):
+        """One-time import of a ConfigFile.csv; returns the number of recipes added."""
+        if not os.path.exists(csv_path):
+            return 0
+        key = 'csv_imported:' + os.path.abspath(csv_path)
+        with self.conn:
+            # BEGIN IMMEDIATE so two stations opening a fresh database import only once
+            self.conn.execute("BEGIN IMMEDIATE")
+            if not force and self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+            now = datetime.now().isoformat(timespec='seconds')
+            added = 0
+            with open(csv_path, 'r', newline='') as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                for row in reader:
+                    if len(row) < 5:
+                        continue
+                    # Duplicate names in the CSV keep the first row, like ConfigRepository
+                    cursor = self.conn.execute(
+                        f"INSERT OR IGNORE INTO recipes ({RECIPE_COLUMNS}, created) VALUES (?, ?, ?, ?, ?, ?)",
+                        (*row[:5], now))
+                    added += cursor.rowcount
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, now))
+        print(f"Imported {added} recipes from {csv_path} into {self.path}")
+        return added
+
+    #----------------------RECIPES----------------------
+    def names(self):
+        return [name for name, in self.conn.execute("SELECT name FROM recipes ORDER BY id")]
+
+    def get(self, name):
+        row = self.conn.execute(f"SELECT {RECIPE_COLUMNS} FROM recipes WHERE name = ?", (name,)).fetchone()
+        return list(row) if row is not None else None
+
+    def __contains__(self, name):
+        return self.conn.execute("SELECT 1 FROM recipes WHERE name = ?", (name,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def add(self, row):
+        try:
+            with self.conn:
+                self.conn.execute(
+                    f"INSERT INTO recipes ({RECIPE_COLUMNS}, created) VALUES (?, ?, ?, ?, ?, ?)",
+                    (*row[:5], datetime.now().isoformat(timespec='seconds')))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Configuration {row[0]!r} already exists") from None
+
+    def delete(self, name):
+        with self.conn:
+            return self.conn.execute("DELETE FROM recipes WHERE name = ?", (name,)).rowcount > 0
+
+    #------------------------RUNS------------------------
+    def add_run(self, recipe_name, started, finished=None, samples=None, peak_force=None,
+                log_path=None, video_path=None):
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (recipe_name, started, finished, samples, peak_force, log_path, video_path)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (recipe_name, started, finished, samples, peak_force, log_path, video_path))
+        return cursor.lastrowid
+
+    def runs(self, recipe_name=None, limit=100):
+        """Newest runs first, optionally only those of one recipe."""
+        query = "SELECT id, recipe_name, started, finished, samples, peak_force, log_path, video_path FROM runs"
+        params = ()
+        if recipe_name is not None:
+            query += " WHERE recipe_name = ?"
+            params = (recipe_name,)
+        query += " ORDER BY started DESC LIMIT ?"
+        return self.conn.execute(query, params + (limit,)).fetchall()
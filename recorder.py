@@ -0,0 +1,78 @@
+import csv
+import queue
+import threading
+
+import cv2
+
+QUEUE_SIZE = 64
+
+
+class VideoRecorder:
+    """Encodes camera frames to a video file on a dedicated thread.
+
+    submit() never blocks: frames go into a bounded queue and, when the
+    encoder falls behind, the oldest queued frame is dropped to make room.
+    Every written frame's monotonic capture timestamp (time.monotonic_ns,
+    the same clock used for force samples) goes to a CSV sidecar next to
+    the video, so the footage can be lined up with the force curve.
+    stop() returns at once; the encoder finishes the queued frames and
+    closes the file on its own thread.
+    """
+
+    def __init__(self, path, fps=30, fourcc='MJPG', queue_size=QUEUE_SIZE):
+        self.path = path
+        self.timestamps_path = path.rsplit('.', 1)[0] + '_frames.csv'
+        self.fps = fps
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        # Not a daemon, so an app exiting right after stop() still finishes the file
+        self._thread = threading.Thread(target=self._run, name='VideoRecorder')
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, frame, timestamp_ns):
+        item = (frame, timestamp_ns)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        # None is the end-of-stream marker; make room for it if necessary
+        self.submit(None, 0)
+
+    def wait(self, timeout=None):
+        """Block until the file is closed; returns False if timeout ran out first."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        writer = None
+        with open(self.timestamps_path, 'w', newline='') as file:
+            timestamps = csv.writer(file)
+            timestamps.writerow(['frame', 'timestamp_ns'])
+            try:
+                while True:
+                    frame, timestamp_ns = self._queue.get()
+                    if frame is None:
+                        break
+                    if writer is None:
+                        height, width = frame.shape[:2]
+                        writer = cv2.VideoWriter(self.path, self.fourcc, self.fps, (width, height),
+                                                 frame.ndim == 3)
+                    writer.write(frame)
+                    timestamps.writerow([self.written, timestamp_ns])
+                    self.written += 1
+            finally:
+                if writer is not None:
+                    writer.release()
+        print(f"Recording saved to {self.path}: {self.written} frames, {self.dropped} dropped")
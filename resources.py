@@ -0,0 +1,43 @@
+import glob
+import os
+
+from PyQt5.QtGui import QIcon, QPixmap
+
+RESOURCE_IMAGES = ('*.png',)
+
+
+class ResourceCache:
+    """Decodes each image in the resource directory once and hands out shared QPixmap/QIcon instances.
+
+    A QIcon built from a file path reads and decodes the file again for every
+    new QIcon. Icons from this cache wrap an already decoded QPixmap, so a
+    toggle handler swapping icons costs no disk access or PNG decoding.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self._pixmaps = {}
+        self._icons = {}
+
+    def pixmap(self, name):
+        pixmap = self._pixmaps.get(name)
+        if pixmap is None:
+            path = os.path.join(self.directory, name)
+            pixmap = QPixmap(path)
+            if pixmap.isNull():
+                print(f"Could not load image {path}")
+            self._pixmaps[name] = pixmap
+        return pixmap
+
+    def icon(self, name):
+        icon = self._icons.get(name)
+        if icon is None:
+            icon = self._icons[name] = QIcon(self.pixmap(name))
+        return icon
+
+    def preload(self):
+        """Decode every image in the directory now instead of on first use."""
+        for pattern in RESOURCE_IMAGES:
+            for path in glob.glob(os.path.join(self.directory, pattern)):
+                self.icon(os.path.basename(path))
+        return len(self._pixmaps)
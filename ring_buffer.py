@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity sample buffer backed by one preallocated NumPy array.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n`` samples are always one contiguous slice. ``window()`` can then
+    return a view instead of copying or concatenating the wrapped halves.
+    """
+
+    def __init__(self, capacity, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self):
+        # Samples appended since the last clear(), including overwritten ones
+        return self._count
+
+    def append(self, value):
+        i = self._count % self.capacity
+        data = self._data
+        data[i] = value
+        data[i + self.capacity] = value
+        self._count += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        n = len(values)
+        if n == 0:
+            return
+        capacity = self.capacity
+        if n > capacity:
+            self._count += n - capacity
+            values = values[-capacity:]
+            n = capacity
+        i = self._count % capacity
+        first = min(n, capacity - i)
+        data = self._data
+        data[i:i + first] = values[:first]
+        data[i + capacity:i + capacity + first] = values[:first]
+        if first < n:
+            rest = n - first
+            data[:rest] = values[first:]
+            data[capacity:capacity + rest] = values[first:]
+        self._count += n
+
+    def clear(self):
+        self._count = 0
+
+    def window(self, n=None):
+        """Read-only view of the newest ``n`` samples (all retained ones by default)."""
+        size = len(self)
+        if n is None or n > size:
+            n = size
+        end = (self._count - 1) % self.capacity + self.capacity + 1 if self._count else 0
+        view = self._data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def last(self):
+        if not self._count:
+            raise IndexError("last() on an empty RingBuffer")
+        return self._data[(self._count - 1) % self.capacity]
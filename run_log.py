@@ -0,0 +1,147 @@
+"""Append-only binary log of every decoded sample in a test run.
+
+File layout: a fixed HEADER_SIZE block (magic, then a JSON header padded
+with spaces) followed by packed RECORD_DTYPE records. The fixed header size
+lets read_run_log() map the records straight into a NumPy array.
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from protocol import ForceMsg, TemperatureMsg, ModeMsg
+
+MAGIC = b'CTTMRUN1'
+HEADER_SIZE = 4096
+RECORD_DTYPE = np.dtype([
+    ('t_ns', '<i8'),            # time.monotonic_ns() at receipt
+    ('force', '<f8'),
+    ('temperature', '<i4'),
+    ('mode', '<i4'),
+])
+MODES = ["READY", "PROCESSING", "PAUSED", "HOMING"]
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+RUN_LOG_DIR = "runs"
+FLUSH_INTERVAL = 0.2            # seconds between chunk writes
+FSYNC_INTERVAL = 1.0            # seconds between fsyncs
+
+
+def new_run_log_path(directory=RUN_LOG_DIR, name=None):
+    """Reserve a new, empty run log file; ``name`` (e.g. the port) keeps concurrent sessions apart."""
+    os.makedirs(directory, exist_ok=True)
+    stem = datetime.now().strftime("run_%Y%m%d_%H%M%S")
+    if name:
+        stem += "_" + re.sub(r'[^\w.-]+', '_', os.path.basename(name)).strip('_')
+    path = os.path.join(directory, f"{stem}.bin")
+    counter = 1
+    while True:
+        try:
+            # Exclusive create: two runs started in the same second never share a file
+            open(path, 'xb').close()
+            return path
+        except FileExistsError:
+            counter += 1
+            path = os.path.join(directory, f"{stem}_{counter}.bin")
+
+
+class RunLogger:
+    """Streams samples to a run log from the acquisition thread.
+
+    log_messages() only appends tuples to a pending list; a writer thread
+    turns them into one NumPy chunk per FLUSH_INTERVAL and fsyncs the file
+    every FSYNC_INTERVAL. close() may run while another thread is still in
+    log_messages(): a batch is either in the final flush or refused.
+    """
+
+    def __init__(self, path, process_config, mode="READY"):
+        self.path = path
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.samples = 0
+        self.peak_force = 0.0
+        self.force = 0.0
+        self.temperature = 0
+        self.mode = MODE_CODES.get(mode, 0)
+        self._pending = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._file = open(path, 'wb')
+        self._write_header(process_config)
+        self._thread = threading.Thread(target=self._run, name='RunLogger', daemon=True)
+        self._thread.start()
+
+    def _write_header(self, process_config):
+        header = json.dumps({
+            'version': 1,
+            'process_config': list(process_config),
+            'started': self.started,
+            'start_ns': time.monotonic_ns(),
+            'dtype': RECORD_DTYPE.descr,
+            'modes': MODES,
+        }).encode()
+        if len(MAGIC) + len(header) + 1 > HEADER_SIZE:
+            raise ValueError("run log header too large")
+        self._file.write(MAGIC + header.ljust(HEADER_SIZE - len(MAGIC) - 1) + b'\n')
+
+    def log_messages(self, messages):
+        records = []
+        append = records.append
+        for message in messages:
+            kind = type(message)
+            if kind is ForceMsg:
+                self.force = message.value
+                if message.value > self.peak_force:
+                    self.peak_force = message.value
+            elif kind is TemperatureMsg:
+                self.temperature = message.value
+            elif kind is ModeMsg:
+                self.mode = MODE_CODES[message.mode]
+            append((message.t_ns, self.force, self.temperature, self.mode))
+        with self._lock:
+            if not self._closed:
+                self._pending += records
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self._file.write(np.array(pending, dtype=RECORD_DTYPE).tobytes())
+            self.samples += len(pending)
+
+    def _run(self):
+        last_sync = time.monotonic()
+        while not self._stop.wait(FLUSH_INTERVAL):
+            self._flush()
+            if time.monotonic() - last_sync >= FSYNC_INTERVAL:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                last_sync = time.monotonic()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        with self._lock:
+            self._closed = True
+        self._flush()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        print(f"Run log saved to {self.path}: {self.samples} samples")
+
+
+def read_run_log(path):
+    """Return (header dict, read-only memmap of RECORD_DTYPE records)."""
+    with open(path, 'rb') as file:
+        block = file.read(HEADER_SIZE)
+    if not block.startswith(MAGIC):
+        raise ValueError(f"{path} is not a CTTM run log")
+    header = json.loads(block[len(MAGIC):])
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count <= 0:
+        return header, np.empty(0, dtype=RECORD_DTYPE)
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+    return header, records
@@ -0,0 +1,45 @@
+from PyQt5.QtCore import QObject, QTimer
+
+
+class RefreshScheduler(QObject):
+    """Runs named GUI refresh tasks, each on its own timer at its own rate.
+
+    Serial data no longer needs polling (it arrives through SerialWorker), so
+    the only periodic work left is presentation: camera, plot and labels.
+    Each task runs at a bounded rate instead of on every event-loop pass.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timers = {}
+
+    def add(self, name, callback, rate_hz, start=False):
+        timer = QTimer(self)
+        timer.timeout.connect(callback)
+        self._timers[name] = timer
+        self.set_rate(name, rate_hz)
+        if start:
+            timer.start()
+
+    def set_rate(self, name, rate_hz):
+        if rate_hz <= 0:
+            raise ValueError(f"refresh rate for {name!r} must be positive, got {rate_hz}")
+        self._timers[name].setInterval(max(1, round(1000 / rate_hz)))
+
+    def rate(self, name):
+        return 1000 / self._timers[name].interval()
+
+    def start(self, name):
+        timer = self._timers[name]
+        if not timer.isActive():
+            timer.start()
+
+    def stop(self, name):
+        self._timers[name].stop()
+
+    def is_active(self, name):
+        return self._timers[name].isActive()
+
+    def stop_all(self):
+        for timer in self._timers.values():
+            timer.stop()
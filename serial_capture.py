@@ -0,0 +1,222 @@
+"""Record the raw byte stream read from the machine and play it back.
+
+File layout: MAGIC, a little-endian uint32 header length and a JSON header,
+then one record per read: RECORD (time.monotonic_ns() at receipt, length)
+followed by the bytes. A file without MAGIC is read as one raw chunk, so
+plain byte dumps replay too.
+
+    python serial_capture.py captures/capture_20260101_120000.cap --speed 0
+"""
+import argparse
+import bisect
+import json
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+
+from protocol import FrameDecoder
+
+MAGIC = b'CTTMCAP1'
+RECORD = struct.Struct('<qI')
+CAPTURE_DIR = "captures"
+FLUSH_INTERVAL = 0.2            # seconds between flushes to the OS
+READ_TIMEOUT = 0.05             # seconds ReplayPort.read waits for data, like serial timeout
+DEFAULT_SPEED = 1.0
+
+
+def new_capture_path(directory=CAPTURE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, datetime.now().strftime("capture_%Y%m%d_%H%M%S.cap"))
+
+
+def replay_speed(value):
+    """Parse a replay speed setting: 0 or "max" replays as fast as possible, a
+    missing, malformed, negative or infinite value gives DEFAULT_SPEED."""
+    if value is None or value == "":
+        return DEFAULT_SPEED
+    if value.strip().lower() == "max":
+        return 0.0
+    try:
+        speed = float(value)
+    except ValueError:
+        speed = None
+    # nan fails both comparisons
+    if speed is None or not 0 <= speed < float('inf'):
+        print(f"Invalid replay speed {value!r}, replaying at {DEFAULT_SPEED:g}x")
+        return DEFAULT_SPEED
+    return speed
+
+
+class SerialCapture:
+    """Appends every chunk read from the port, with its receipt time, to a capture file.
+
+    write() is called from the acquisition thread; the file is buffered and
+    flushed every FLUSH_INTERVAL so a crash loses at most that much.
+    """
+
+    def __init__(self, path, port=None):
+        self.path = path
+        self.chunks = 0
+        self.bytes = 0
+        self._file = open(path, 'wb', buffering=1 << 20)
+        header = json.dumps({'port': port, 'started': datetime.now().isoformat(timespec='seconds')}).encode()
+        self._file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        self._flush_interval_ns = int(FLUSH_INTERVAL * 1e9)
+        self._flushed_ns = time.monotonic_ns()
+
+    def write(self, chunk, t_ns):
+        self._file.write(RECORD.pack(t_ns, len(chunk)))
+        self._file.write(chunk)
+        self.chunks += 1
+        self.bytes += len(chunk)
+        if t_ns - self._flushed_ns > self._flush_interval_ns:
+            self._file.flush()
+            self._flushed_ns = t_ns
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_capture(path):
+    """Returns (header, [(t_ns, bytes), ...]); a record cut short by a crash is dropped."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        return {}, [(0, data)] if data else []
+    pos = len(MAGIC)
+    (length,) = struct.unpack_from('<I', data, pos)
+    pos += 4
+    header = json.loads(data[pos:pos + length])
+    pos += length
+    chunks = []
+    while pos + RECORD.size <= len(data):
+        t_ns, length = RECORD.unpack_from(data, pos)
+        pos += RECORD.size
+        chunk = data[pos:pos + length]
+        if len(chunk) < length:
+            break
+        chunks.append((t_ns, chunk))
+        pos += length
+    return header, chunks
+
+
+class ReplayPort:
+    """Serial-like source that releases captured chunks at their recorded pace.
+
+    ``speed`` scales the pace (2 = twice as fast); 0 makes the whole capture
+    readable at once. The clock starts on the first read, or with
+    ``start_on_write`` on the first write, e.g. TX_START from start_process.
+    Writes are kept in ``written`` and otherwise ignored.
+    """
+
+    def __init__(self, chunks, speed=1.0, timeout=READ_TIMEOUT, port="replay", start_on_write=False):
+        self.port = port
+        self.speed = speed
+        self.timeout = timeout
+        self.start_on_write = start_on_write
+        self.stream = b''.join(chunk for _, chunk in chunks)
+        self.written = []
+        self.cursor = 0
+        self._ends = []
+        self._due = []
+        end = 0
+        t0 = chunks[0][0] if chunks else 0
+        for t_ns, chunk in chunks:
+            end += len(chunk)
+            self._ends.append(end)
+            self._due.append((t_ns - t0) / 1e9 / speed if speed > 0 else 0.0)
+        self._start = None
+        self._cancelled = False
+        # Set by write() and cancel_read() so a waiting read() notices at once
+        self._wake = threading.Event()
+
+    @classmethod
+    def open(cls, path, speed=1.0, **options):
+        _, chunks = read_capture(path)
+        return cls(chunks, speed, port=path, **options)
+
+    @property
+    def exhausted(self):
+        return self.cursor >= len(self.stream)
+
+    def _elapsed(self):
+        if self._start is None:
+            if self.start_on_write:
+                return -1.0
+            self._start = time.perf_counter()
+        return time.perf_counter() - self._start
+
+    def _due_end(self, elapsed):
+        due = bisect.bisect_right(self._due, elapsed)
+        return self._ends[due - 1] if due else 0
+
+    @property
+    def in_waiting(self):
+        return max(self._due_end(self._elapsed()) - self.cursor, 0)
+
+    def read(self, size=1):
+        deadline = time.perf_counter() + self.timeout
+        while not self._cancelled:
+            elapsed = self._elapsed()
+            end = self._due_end(elapsed)
+            if end > self.cursor:
+                break
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return b''
+            # Sleep until the next chunk is due, but no longer than the timeout
+            next_due = bisect.bisect_right(self._due, elapsed)
+            if next_due < len(self._due):
+                remaining = min(remaining, self._due[next_due] - elapsed)
+            self._wake.wait(max(remaining, 0))
+            self._wake.clear()
+        else:
+            return b''
+        new_cursor = min(self.cursor + size, end)
+        chunk = self.stream[self.cursor:new_cursor]
+        self.cursor = new_cursor
+        return chunk
+
+    def write(self, data):
+        self.written.append(bytes(data))
+        if self._start is None:
+            self._start = time.perf_counter()
+            self._wake.set()
+        return len(data)
+
+    def cancel_read(self):
+        self._cancelled = True
+        self._wake.set()
+
+    def close(self):
+        self.cancel_read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a capture through the frame decoder and report throughput")
+    parser.add_argument('capture')
+    parser.add_argument('--speed', type=float, default=0, help='1 = recorded pace, 0 = as fast as possible')
+    args = parser.parse_args()
+
+    header, chunks = read_capture(args.capture)
+    recorded = (chunks[-1][0] - chunks[0][0]) / 1e9 if chunks else 0.0
+    port = ReplayPort(chunks, args.speed)
+    decoder = FrameDecoder()
+    messages = 0
+    start = time.perf_counter()
+    while not port.exhausted:
+        chunk = port.read(max(port.in_waiting, 1))
+        if chunk:
+            messages += len(decoder.feed(chunk, time.monotonic_ns()))
+    wall = time.perf_counter() - start
+    print(f"{args.capture}: {len(port.stream):,} bytes in {len(chunks):,} reads over {recorded:.2f} s"
+          f" from {header.get('port') or 'raw file'}")
+    print(f"Replayed in {wall:.3f} s: {messages:,} messages, {decoder.rejected} rejected,"
+          f" {messages / wall if wall else 0:,.0f} messages/s, {len(port.stream) / wall / 1e6 if wall else 0:.1f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import time
+
+import serial
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from protocol import FrameDecoder, ModeMsg
+
+READ_CHUNK_SIZE = 4096
+
+
+class SerialWorker(QThread):
+    """Reads the machine port on its own thread and hands decoded messages to the GUI."""
+
+    messages_received = pyqtSignal(list)
+    serial_error = pyqtSignal(str)
+    break_detected = pyqtSignal(object)
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.ser = ser
+        self.decoder = FrameDecoder()
+        # Optional RunLogger, fed from this thread so logging costs the GUI nothing
+        self.run_logger = None
+        # Optional CommandQueue; mode replies are matched here, not on the GUI thread
+        self.command_queue = None
+        # Optional BreakDetector; it pauses the machine from this thread
+        self.break_detector = None
+        # Optional SerialCapture; raw bytes are teed to it before decoding
+        self.capture = None
+        # Set before the thread starts so a stop() before run() sticks
+        self._running = True
+
+    def run(self):
+        self.decoder.reset()
+        while self._running:
+            try:
+                # Block in the driver for at least one byte, then take whatever
+                # else is already waiting in a single read call.
+                waiting = self.ser.in_waiting
+                chunk = self.ser.read(min(max(waiting, 1), READ_CHUNK_SIZE))
+            except (serial.SerialException, OSError) as e:
+                if self._running:
+                    self.serial_error.emit(str(e))
+                break
+            if not chunk:
+                continue
+            # Receipt time of every frame completed by this chunk
+            t_ns = time.monotonic_ns()
+            capture = self.capture
+            if capture is not None:
+                capture.write(chunk, t_ns)
+            messages = self.decoder.feed(chunk, t_ns)
+            if messages:
+                detector = self.break_detector
+                if detector is not None and detector.feed(messages) is not None:
+                    self._pause_machine(detector)
+                run_logger = self.run_logger
+                if run_logger is not None:
+                    run_logger.log_messages(messages)
+                command_queue = self.command_queue
+                if command_queue is not None and command_queue.awaiting is not None:
+                    for message in messages:
+                        if type(message) is ModeMsg:
+                            command_queue.acknowledge(message)
+                self.messages_received.emit(messages)
+        self._running = False
+
+    def _pause_machine(self, detector):
+        command_queue = self.command_queue
+        if command_queue is not None:
+            detector.sent(command_queue.send_now(detector.command).sent_ns)
+        else:
+            try:
+                self.ser.write(detector.command.encode())
+            except (serial.SerialException, OSError) as e:
+                self.serial_error.emit(str(e))
+            detector.sent()
+        self.break_detected.emit(detector)
+
+    def stop(self):
+        self._running = False
+        cancel_read = getattr(self.ser, 'cancel_read', None)
+        if cancel_read is not None:
+            try:
+                cancel_read()
+            except Exception:
+                pass
+        self.wait()
@@ -0,0 +1,211 @@
+"""Virtual CTTM machine on a pseudo-terminal, for load testing without the bench.
+
+    python simulator.py --rate 20000 --link /tmp/ttyCTTM0
+
+The printed port (or the --link path) opens like any serial port. To have
+it listed in the app's port combo box, start the app with
+CTTM_EXTRA_PORTS=/tmp/ttyCTTM0. The simulator answers TX_START, TX_PAUSE and
+TX_RESET the way the machine does. While processing it streams *FRC: frames
+along a tensile curve at --rate frames/s, and it sends *TEP: frames at
+--temperature-rate the whole time.
+"""
+import argparse
+import errno
+import math
+import os
+import random
+import re
+import select
+import sys
+import time
+import tty
+
+from protocol import (TX_START, TX_PAUSE, TX_RESET, RX_START, RX_PAUSE, RX_RESET, RX_READY,
+                      FORCE_SCALE)
+
+TICK = 0.001                    # seconds between streaming bursts
+MAX_FORCE_VALUE = 999999        # six digits in *FRC:xxxxxx#
+
+
+def _command_prefix(template):
+    return template.split('{')[0].encode()
+
+
+_START = _command_prefix(TX_START)
+_PAUSE = _command_prefix(TX_PAUSE)
+_RESET = _command_prefix(TX_RESET)
+_COMMAND_RE = re.compile(rb'\*[^*#]{1,64}#')
+
+
+class ForceCurve:
+    """Tensile pull: toe, linear rise, yield to a peak, then a sharp break."""
+
+    def __init__(self, peak_force=56.0, duration=10.0, noise=0.002):
+        self.peak_force = peak_force
+        self.duration = duration
+        self.noise = noise
+
+    def __call__(self, t):
+        x = t / self.duration
+        if x < 0.05:
+            force = 0.02 * (x / 0.05) ** 2
+        elif x < 0.6:
+            force = 0.02 + 0.78 * (x - 0.05) / 0.55
+        elif x < 0.8:
+            force = 0.8 + 0.2 * math.sin((x - 0.6) / 0.2 * math.pi / 2)
+        elif x < 0.82:
+            force = 1.0 - 0.95 * (x - 0.8) / 0.02
+        else:
+            force = 0.05 * math.exp(-(x - 0.82) * 10)
+        force = self.peak_force * (force + random.gauss(0, self.noise))
+        return min(max(int(force * FORCE_SCALE), 0), MAX_FORCE_VALUE)
+
+
+class MachineSimulator:
+
+    def __init__(self, rate=1000, temperature_rate=10, peak_force=56.0, duration=10.0,
+                 temperature=25, homing_time=1.0, link=None):
+        self.rate = rate
+        self.temperature_rate = temperature_rate
+        self.curve = ForceCurve(peak_force, duration)
+        self.temperature = temperature
+        self.setpoint = temperature
+        self.homing_time = homing_time
+        self.link = link
+        self.mode = "READY"
+        self.frames_sent = 0
+        self.bytes_dropped = 0
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        if link:
+            if os.path.islink(link):
+                os.unlink(link)
+            os.symlink(self.port, link)
+        self._rx = bytearray()
+        self._elapsed = 0.0             # process time accumulated while PROCESSING
+        self._force_sent = 0
+        self._homing_until = 0.0
+        self._next_temperature = 0.0
+        self._running = False
+
+    def close(self):
+        self._running = False
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _send(self, data):
+        try:
+            written = os.write(self._master, data)
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EIO):
+                raise
+            written = 0
+        # A full pty buffer is a host that stopped reading: drop like a UART overrun
+        self.bytes_dropped += len(data) - written
+
+    def _handle_command(self, frame):
+        if frame.startswith(_START):
+            fields = frame[len(_START):-1].split(b':')
+            try:
+                self.setpoint = int(fields[2])
+                if int(fields[3]) > 0:
+                    self.curve.peak_force = float(fields[3])
+            except (IndexError, ValueError):
+                pass
+            if self.mode in ("READY", "PAUSED"):
+                self.mode = "PROCESSING"
+                self._send(RX_START.encode())
+        elif frame.startswith(_PAUSE):
+            if self.mode == "PROCESSING":
+                self.mode = "PAUSED"
+                self._send(RX_PAUSE.encode())
+        elif frame.startswith(_RESET):
+            self.mode = "HOMING"
+            self._send(RX_RESET.encode())
+            self._homing_until = time.monotonic() + self.homing_time
+        else:
+            print(f"Manual command {frame.decode(errors='replace')}")
+
+    def _read_commands(self):
+        try:
+            data = os.read(self._master, 4096)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EIO):
+                return
+            raise
+        self._rx += data
+        last = self._rx.rfind(b'#')
+        if last < 0:
+            return
+        for frame in _COMMAND_RE.findall(self._rx, 0, last + 1):
+            self._handle_command(bytes(frame))
+        del self._rx[:last + 1]
+
+    def _stream(self, now, dt):
+        out = []
+        if self.mode == "PROCESSING":
+            self._elapsed += dt
+            due = int(self._elapsed * self.rate) - self._force_sent
+            if due > 0:
+                step = 1.0 / self.rate
+                t = self._force_sent * step
+                curve = self.curve
+                out += [b'*FRC:%06d#' % curve(t + i * step) for i in range(due)]
+                self._force_sent += due
+        elif self.mode == "HOMING" and now >= self._homing_until:
+            self.mode = "READY"
+            self._elapsed = 0.0
+            self._force_sent = 0
+            out.append(RX_READY.encode())
+        if now >= self._next_temperature:
+            self._next_temperature = now + 1.0 / self.temperature_rate
+            self.temperature += (self.setpoint > self.temperature) - (self.setpoint < self.temperature)
+            out.append(b'*TEP:%03d#' % self.temperature)
+        if out:
+            self.frames_sent += len(out)
+            self._send(b''.join(out))
+
+    def run(self, duration=None):
+        self._running = True
+        start = last = time.monotonic()
+        while self._running:
+            readable, _, _ = select.select([self._master], [], [], TICK)
+            if readable:
+                self._read_commands()
+            now = time.monotonic()
+            self._stream(now, now - last)
+            last = now
+            if duration is not None and now - start >= duration:
+                break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=1000, help='force frames per second while processing')
+    parser.add_argument('--temperature-rate', type=float, default=10, help='temperature frames per second')
+    parser.add_argument('--peak-force', type=float, default=56.0, help='peak of the force curve (g)')
+    parser.add_argument('--pull-time', type=float, default=10.0, help='seconds from start to past the break')
+    parser.add_argument('--homing-time', type=float, default=1.0)
+    parser.add_argument('--link', help='symlink to create for the pty, e.g. /tmp/ttyCTTM0')
+    parser.add_argument('--duration', type=float, help='exit after this many seconds')
+    args = parser.parse_args(argv)
+
+    simulator = MachineSimulator(rate=args.rate, temperature_rate=args.temperature_rate,
+                                 peak_force=args.peak_force, duration=args.pull_time,
+                                 homing_time=args.homing_time, link=args.link)
+    print(f"CTTM simulator on {simulator.port}" + (f" ({args.link})" if args.link else ""), flush=True)
+    try:
+        simulator.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{simulator.frames_sent} frames sent, {simulator.bytes_dropped} bytes dropped")
+        simulator.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import time
+
+
+class StartupProfile:
+    """Wall-clock time of each startup phase, reported once the main window first paints."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+        self.reported = False
+        self._last = self.start
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def report(self):
+        self.reported = True
+        print(f"Startup: {(self._last - self.start) * 1000:.0f} ms to first paint")
+        for phase, ms in self.phases:
+            print(f"  {phase:<20} {ms:8.1f} ms")
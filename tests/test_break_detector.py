@@ -0,0 +1,53 @@
+import pytest
+
+from break_detector import BreakDetector
+from protocol import ForceMsg, ModeMsg
+
+PROCESSING = ModeMsg("PROCESSING")
+
+
+def forces(*values, start=0):
+    return [ForceMsg(value, start + i) for i, value in enumerate(values)]
+
+
+def test_break_fires_once_on_the_confirming_sample():
+    detector = BreakDetector("*1:2:005:120:037:056#", drop=0.5, confirm=3)
+    assert detector.feed([PROCESSING] + forces(10, 40, 60, 50)) is None
+    trigger = detector.feed(forces(29, 28, 27, 26, start=10))
+    assert trigger == ForceMsg(27, 12)
+    assert detector.reason == "break"
+    assert detector.peak_force == 60
+    assert detector.feed(forces(0, 0, 0)) is None
+
+
+def test_single_noisy_dip_does_not_fire():
+    detector = BreakDetector("pause", drop=0.5, confirm=3)
+    assert detector.feed([PROCESSING] + forces(60, 20, 20, 55, 20, 58, 61)) is None
+    assert not detector.triggered
+
+
+def test_only_active_while_processing():
+    detector = BreakDetector("pause", confirm=1)
+    assert detector.feed(forces(60, 0)) is None
+    detector = BreakDetector("pause", confirm=1, mode="PROCESSING")
+    assert detector.feed(forces(60) + [ModeMsg("PAUSED")] + forces(0)) is None
+
+
+def test_small_forces_never_count_as_a_break():
+    detector = BreakDetector("pause", min_peak=1.0, confirm=1)
+    assert detector.feed([PROCESSING] + forces(0.5, 0.1, 0.0)) is None
+
+
+def test_stop_force_fires_at_the_recipe_peak():
+    detector = BreakDetector("pause", stop_force=56, confirm=2)
+    trigger = detector.feed([PROCESSING] + forces(40, 56, 57, 58))
+    assert trigger == ForceMsg(57, 2)
+    assert detector.reason == "peak force"
+
+
+def test_latency_from_receipt_to_sent():
+    detector = BreakDetector("pause", confirm=1)
+    detector.feed([PROCESSING] + forces(50, 1, start=1_000_000))
+    assert detector.latency_ms is None
+    detector.sent(3_500_000)
+    assert detector.latency_ms == pytest.approx(2.5, abs=1e-5)
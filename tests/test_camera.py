@@ -0,0 +1,41 @@
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+import camera
+from camera import CameraWorker
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class SlowCapture:
+    """A device that takes a while to open, like a USB camera waking up."""
+
+    released = []
+
+    def __init__(self, device):
+        time.sleep(0.3)
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        time.sleep(0.01)
+        return False, None
+
+    def release(self):
+        self.released.append(True)
+
+
+def test_stop_while_the_device_opens_releases_it(monkeypatch):
+    SlowCapture.released.clear()
+    monkeypatch.setattr(camera.cv2, 'VideoCapture', SlowCapture)
+    worker = CameraWorker(0)
+    worker.start()
+    worker.stop()
+    assert worker.isFinished()
+    assert SlowCapture.released == [True]
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+import serial
+from PyQt5.QtCore import QCoreApplication
+
+from command_queue import CommandQueue, CommandError, NO_REPLY, WRITE_FAILED, STOPPED
+from protocol import ModeMsg
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakePort:
+    """Records writes; ``reply(data, attempt)`` returns the mode to acknowledge, if any."""
+
+    def __init__(self, reply=None, fail=False):
+        self.reply = reply
+        self.fail = fail
+        self.queue = None
+        self.written = []
+        self.wrote = threading.Condition()
+
+    def write(self, data):
+        if self.fail:
+            raise serial.SerialException("port gone")
+        data = data.decode()
+        with self.wrote:
+            self.written.append(data)
+            self.wrote.notify_all()
+        mode = self.reply(data, self.written.count(data)) if self.reply else None
+        if mode is not None:
+            self.queue.acknowledge(ModeMsg(mode, time.monotonic_ns()))
+        return len(data)
+
+    def wait_written(self, count, timeout=2.0):
+        with self.wrote:
+            return self.wrote.wait_for(lambda: len(self.written) >= count, timeout)
+
+
+@pytest.fixture
+def make_queue():
+    queues = []
+
+    def make(port):
+        queue = CommandQueue(port)
+        port.queue = queue
+        failed = []
+        queue.command_failed.connect(lambda data, reason: failed.append((data, reason)))
+        queue.failed = failed
+        queue.start()
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.stop()
+
+
+def test_acknowledged_command_reports_its_round_trip(make_queue):
+    queue = make_queue(FakePort(reply=lambda data, attempt: "PROCESSING"))
+    command = queue.submit("*1:1:005:120:037:056#", expect="PROCESSING").wait(2)
+    assert command.attempts == 1
+    assert command.rtt_ms is not None and command.rtt_ms >= 0
+    assert list(queue.rtt_ms) == [command.rtt_ms]
+
+
+def test_unanswered_command_is_resent_then_fails(make_queue):
+    port = FakePort()
+    queue = make_queue(port)
+    command = queue.submit("*1:2:000:000:000:000#", expect="PAUSED", retries=1, timeout=0.05)
+    with pytest.raises(CommandError):
+        command.wait(2)
+    assert command.error == NO_REPLY
+    assert port.written == ["*1:2:000:000:000:000#"] * 2
+    # command_failed is queued to this thread
+    QCoreApplication.processEvents()
+    assert queue.failed == [("*1:2:000:000:000:000#", NO_REPLY)]
+
+
+def test_reply_to_the_retry_succeeds(make_queue):
+    port = FakePort(reply=lambda data, attempt: "PAUSED" if attempt == 2 else None)
+    queue = make_queue(port)
+    command = queue.submit("*1:2:000:000:000:000#", expect="PAUSED", retries=1, timeout=0.05).wait(2)
+    assert command.attempts == 2
+    QCoreApplication.processEvents()
+    assert queue.failed == []
+
+
+def test_stale_or_wrong_replies_are_not_acknowledgements(make_queue):
+    port = FakePort()
+    queue = make_queue(port)
+    command = queue.submit("start", expect="PROCESSING", retries=0, timeout=0.2)
+    assert port.wait_written(1)
+    queue.acknowledge(ModeMsg("PROCESSING", 0))             # received before the write
+    queue.acknowledge(ModeMsg("PAUSED", time.monotonic_ns()))
+    with pytest.raises(CommandError):
+        command.wait(2)
+    assert command.error == NO_REPLY
+
+
+def test_keyed_commands_coalesce_while_queued(make_queue):
+    port = FakePort()
+    queue = make_queue(port)
+    # Hold the queue on a command waiting for its reply
+    blocker = queue.submit("start", expect="PROCESSING", retries=0, timeout=5)
+    assert port.wait_written(1)
+    heater = [queue.submit(data, key="heater") for data in ("on", "off", "on", "off")]
+    queue.acknowledge(ModeMsg("PROCESSING", time.monotonic_ns()))
+    blocker.wait(2)
+    heater[-1].wait(2)
+    assert port.written == ["start", "off"]
+    assert all(command.error is None for command in heater)
+
+
+def test_write_failure_is_reported(make_queue):
+    queue = make_queue(FakePort(fail=True))
+    command = queue.submit("*2:7:1#")
+    with pytest.raises(CommandError):
+        command.wait(2)
+    assert command.error == WRITE_FAILED
+    assert queue.send_now("*1:2:000:000:000:000#").error == WRITE_FAILED
+
+
+def test_stop_finishes_queued_commands(make_queue):
+    port = FakePort()
+    queue = make_queue(port)
+    queue.submit("start", expect="PROCESSING", retries=0, timeout=5)
+    assert port.wait_written(1)
+    queued = queue.submit("*2:7:1#")
+    queue.stop()
+    assert queued.error == STOPPED
+    assert queue.submit("late").error == STOPPED
@@ -0,0 +1,117 @@
+import os
+import stat
+import threading
+
+import pytest
+
+import config_store
+from config_store import ConfigRepository, CONFIG_FIELDS
+
+ROWS = [
+    ['config1', '5', '120', '37', '56'],
+    ['config2', '3', '100', '40', '20'],
+    ['config1', '9', '999', '99', '99'],
+]
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / 'ConfigFile.csv'
+    path.write_text('\n'.join(','.join(row) for row in [CONFIG_FIELDS] + ROWS) + '\n')
+    return str(path)
+
+
+def test_lookup_keeps_the_first_of_duplicate_names(config_file):
+    configs = ConfigRepository(config_file)
+    assert configs.names() == ['config1', 'config2']
+    assert configs.get('config1') == ROWS[0]
+    assert configs.get('missing') is None
+    assert 'config2' in configs
+    assert len(configs) == 2
+
+
+def test_missing_file_is_an_empty_repository(tmp_path):
+    configs = ConfigRepository(str(tmp_path / 'none.csv'))
+    assert configs.names() == []
+
+
+def test_add_and_delete_persist(config_file):
+    configs = ConfigRepository(config_file)
+    configs.add(['config3', '1', '2', '3', '4'])
+    with pytest.raises(ValueError):
+        configs.add(['config3', '1', '2', '3', '4'])
+    assert configs.delete('config2')
+    assert not configs.delete('config2')
+    assert ConfigRepository(config_file).names() == ['config1', 'config3']
+
+
+def test_file_is_parsed_once_until_it_changes(config_file, monkeypatch):
+    configs = ConfigRepository(config_file)
+    configs.names()
+    parsed = []
+    real_open = open
+    monkeypatch.setattr('builtins.open', lambda *a, **k: parsed.append(a[0]) or real_open(*a, **k))
+    configs.names()
+    configs.get('config1')
+    assert parsed == []
+    monkeypatch.undo()
+
+    # Another station rewrites the shared file
+    with open(config_file, 'a') as f:
+        f.write('config9,1,1,1,1\n')
+    assert 'config9' in configs
+
+
+def test_failed_write_leaves_the_file_and_no_temp_file(config_file, monkeypatch):
+    before = open(config_file).read()
+    configs = ConfigRepository(config_file)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        configs.delete('config2')
+    assert open(config_file).read() == before
+    assert os.listdir(os.path.dirname(config_file)) == ['ConfigFile.csv']
+    assert 'config2' in configs
+
+
+def test_delete_keeps_the_file_mode(config_file):
+    os.chmod(config_file, 0o664)
+    ConfigRepository(config_file).delete('config2')
+    assert stat.S_IMODE(os.stat(config_file).st_mode) == 0o664
+
+
+def test_stations_adding_at_once_keep_every_recipe(config_file):
+    names = [f'station{i}' for i in range(8)]
+    start = threading.Barrier(len(names))
+
+    def save(name):
+        station = ConfigRepository(config_file)
+        station.names()
+        start.wait()
+        station.add([name, '1', '2', '3', '4'])
+
+    threads = [threading.Thread(target=save, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(ConfigRepository(config_file).names()) == sorted(['config1', 'config2'] + names)
+    with pytest.raises(ValueError):
+        ConfigRepository(config_file).add(['station0', '5', '6', '7', '8'])
+
+
+def test_add_to_a_new_file_writes_the_header(tmp_path):
+    path = str(tmp_path / 'new.csv')
+    ConfigRepository(path).add(['config1', '1', '2', '3', '4'])
+    assert open(path).read().splitlines() == [','.join(CONFIG_FIELDS), 'config1,1,2,3,4']
+
+
+def test_lock_left_by_a_crash_is_taken_over(config_file, monkeypatch):
+    monkeypatch.setattr(config_store, 'LOCK_TIMEOUT', 0.05)
+    open(config_file + '.lock', 'w').close()
+    ConfigRepository(config_file).add(['config3', '1', '2', '3', '4'])
+    assert not os.path.exists(config_file + '.lock')
+    assert 'config3' in ConfigRepository(config_file)
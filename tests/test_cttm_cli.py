@@ -0,0 +1,65 @@
+from cttm_cli import run_test, report_verdict, EXIT_PASS, EXIT_FAIL, EXIT_ERROR
+from protocol import ForceMsg, ModeMsg, TX_START, TX_PAUSE, TX_RESET
+from run_log import RunLogger
+
+CONFIG = ['config1', '5', '120', '37', '56']
+
+
+class FakeMachine:
+    """Reports the modes listed in ``replies`` after each command, one per poll."""
+
+    def __init__(self, replies):
+        self.name = 'fake'
+        self.mode = "READY"
+        self.error = None
+        self.sent = []
+        self.replies = replies
+        self._pending = []
+
+    def send(self, template):
+        self.sent.append(template)
+        self._pending = list(self.replies.get(template, ()))
+
+    def wait_for(self, predicate, timeout):
+        while not predicate(self):
+            if not self._pending:
+                return False
+            self.mode = self._pending.pop(0)
+        return self.error is None
+
+
+def test_run_test_starts_then_resets():
+    machine = FakeMachine({TX_START: ["PROCESSING", "PAUSED"], TX_RESET: ["HOMING", "READY"]})
+    assert run_test(machine) is None
+    assert machine.sent == [TX_START, TX_RESET]
+
+
+def test_run_test_pauses_after_max_duration():
+    machine = FakeMachine({TX_START: ["PROCESSING"], TX_PAUSE: ["PAUSED"], TX_RESET: ["HOMING", "READY"]})
+    assert run_test(machine, max_duration=0.1) is None
+    assert machine.sent == [TX_START, TX_PAUSE, TX_RESET]
+
+
+def test_run_test_reports_a_machine_that_does_not_start():
+    machine = FakeMachine({})
+    assert run_test(machine, start_timeout=0.5) == "machine did not start within 0.5 s"
+    assert machine.sent == [TX_START]
+
+
+def test_run_test_reports_the_port_error():
+    machine = FakeMachine({TX_START: ["PROCESSING"]})
+    machine.error = "stopped"
+    assert run_test(machine) == "stopped"
+
+
+def test_verdict_comes_from_the_run_log(tmp_path):
+    def log(path, peak):
+        logger = RunLogger(str(path), CONFIG)
+        logger.log_messages([ModeMsg("PROCESSING", 0)] +
+                            [ForceMsg(peak * min(i, 20 - i) / 10, i * 10**6) for i in range(21)])
+        logger.close()
+        return logger.path
+
+    assert report_verdict('a', None, log(tmp_path / 'pass.bin', 60.0)) == EXIT_PASS
+    assert report_verdict('b', None, log(tmp_path / 'fail.bin', 30.0)) == EXIT_FAIL
+    assert report_verdict('c', "stopped", None) == EXIT_ERROR
@@ -0,0 +1,16 @@
+import threading
+
+from multi_machine import MachineSession
+
+
+def test_stop_wakes_a_pending_wait_for():
+    session = MachineSession('/dev/null-port')
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(
+        session.wait_for(lambda s: s.mode == "PROCESSING", timeout=30)))
+    waiter.start()
+    session.stop()
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert result == [False]
+    assert session.error == "stopped"
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+import port_watcher
+from port_watcher import PortWatcher, port_identity
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def info(device, vid=None, pid=None, serial_number=None):
+    return SimpleNamespace(device=device, vid=vid, pid=pid, serial_number=serial_number)
+
+
+def test_identity_prefers_serial_number_then_vid_pid_then_path():
+    assert port_identity(info('/dev/ttyUSB0', 0x0403, 0x6001, 'A1B2')) == ('usb', 0x0403, 0x6001, 'A1B2')
+    assert port_identity(info('/dev/ttyUSB0', 0x0403, 0x6001)) == ('usb', 0x0403, 0x6001)
+    assert port_identity(info('/dev/ttyS0')) == ('device', '/dev/ttyS0')
+
+
+def test_refresh_caches_ports_and_reports_changes(monkeypatch, tmp_path):
+    extra = tmp_path / 'ttyCTTM0'
+    extra.touch()
+    found = [info('/dev/ttyUSB0', 1, 2, 'SN')]
+    monkeypatch.setattr(port_watcher.serial.tools.list_ports, 'comports', lambda: found)
+    watcher = PortWatcher([str(extra), str(tmp_path / 'missing')])
+    assert watcher.refresh()
+    assert watcher.ports == ['/dev/ttyUSB0', str(extra)]
+    assert not watcher.refresh()
+    assert watcher.identity('/dev/ttyUSB0') == ('usb', 1, 2, 'SN')
+    found.clear()
+    assert watcher.refresh()
+    assert watcher.ports == [str(extra)]
+
+
+def test_reconnect_finds_the_same_adapter_under_a_new_name(monkeypatch):
+    opened = []
+
+    class FakeSerial:
+        def __init__(self, device, **options):
+            opened.append(device)
+            self.port = device
+
+    monkeypatch.setattr(port_watcher.serial, 'Serial', FakeSerial)
+    found = [info('/dev/ttyUSB0', 1, 2, 'OTHER'), info('/dev/ttyUSB1', 1, 2, 'SN')]
+    monkeypatch.setattr(port_watcher.serial.tools.list_ports, 'comports', lambda: found)
+    watcher = PortWatcher()
+    reconnected = []
+    watcher.reconnected.connect(lambda ser, device, downtime: reconnected.append((ser.port, device)))
+    watcher.refresh()
+    watcher.reconnect(('usb', 1, 2, 'SN'), lost_at=0.0)
+    assert watcher._try_reconnect(('usb', 1, 2, 'SN'))
+    QCoreApplication.processEvents()
+    assert opened == ['/dev/ttyUSB1']
+    assert reconnected == [('/dev/ttyUSB1', '/dev/ttyUSB1')]
+    assert not watcher.reconnecting
+
+
+def test_cancelled_reconnect_closes_the_reopened_port(monkeypatch):
+    closed = []
+
+    class FakeSerial:
+        def __init__(self, device, **options):
+            # The user picks another port while this one is being opened
+            watcher.cancel_reconnect()
+
+        def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(port_watcher.serial, 'Serial', FakeSerial)
+    monkeypatch.setattr(port_watcher.serial.tools.list_ports, 'comports', lambda: [info('/dev/ttyUSB1', 1, 2)])
+    watcher = PortWatcher()
+    reconnected = []
+    watcher.reconnected.connect(lambda *args: reconnected.append(args))
+    watcher.refresh()
+    watcher.reconnect(('usb', 1, 2))
+    watcher._try_reconnect(('usb', 1, 2))
+    QCoreApplication.processEvents()
+    assert closed == [True]
+    assert reconnected == []
+
+
+def test_stop_right_after_start_ends_the_thread(monkeypatch):
+    monkeypatch.setattr(port_watcher.serial.tools.list_ports, 'comports', lambda: [])
+    watcher = PortWatcher()
+    watcher.start()
+    watcher.stop()
+    assert watcher.isFinished()
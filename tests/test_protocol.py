@@ -0,0 +1,55 @@
+from protocol import (FrameDecoder, ForceMsg, TemperatureMsg, ModeMsg, MAX_FRAME_LENGTH, TX_START,
+                      format_process_command)
+
+
+def test_decodes_every_frame_type():
+    decoder = FrameDecoder()
+    messages = decoder.feed(b'*TEP:037#*FRC:005625#*PRS:STR#*PRS:PUS#*PRS:HOM#*PRS:RED#', 7)
+    assert messages == [
+        TemperatureMsg(37, 7),
+        ForceMsg(56.25, 7),
+        ModeMsg("PROCESSING", 7),
+        ModeMsg("PAUSED", 7),
+        ModeMsg("HOMING", 7),
+        ModeMsg("READY", 7),
+    ]
+    assert decoder.frames == 6
+    assert decoder.rejected == 0
+
+
+def test_frame_split_across_chunks_is_stamped_by_the_completing_chunk():
+    decoder = FrameDecoder()
+    assert decoder.feed(b'*FRC:00', 1) == []
+    assert decoder.feed(b'12', 2) == []
+    assert decoder.feed(b'34#*TE', 3) == [ForceMsg(12.34, 3)]
+    assert decoder.feed(b'P:025#', 4) == [TemperatureMsg(25, 4)]
+
+
+def test_line_noise_between_frames_is_skipped():
+    decoder = FrameDecoder()
+    messages = decoder.feed(b'\x00garbage*FRC:000100#junk#*XYZ:1#*TEP:030#')
+    assert messages == [ForceMsg(1.0), TemperatureMsg(30)]
+
+
+def test_malformed_payloads_are_counted_as_rejected():
+    decoder = FrameDecoder()
+    assert decoder.feed(b'*FRC:12ab#*PRS:BAD#*TEP:020#') == [TemperatureMsg(20)]
+    assert decoder.rejected == 2
+
+
+def test_overlong_partial_frame_is_dropped():
+    decoder = FrameDecoder()
+    decoder.feed(b'*FRC:' + b'1' * MAX_FRAME_LENGTH)
+    # The stale partial is gone, so the closing '#' cannot complete it
+    assert decoder.feed(b'#*TEP:021#') == [TemperatureMsg(21)]
+
+
+def test_reset_discards_a_partial_frame():
+    decoder = FrameDecoder()
+    decoder.feed(b'*FRC:0001')
+    decoder.reset()
+    assert decoder.feed(b'00#') == []
+
+
+def test_format_process_command_pads_recipe_fields():
+    assert format_process_command(TX_START, ['config1', '5', '120', '37', '56']) == "*1:1:005:120:037:056#"
@@ -0,0 +1,69 @@
+import csv
+import os
+
+import pytest
+
+from config_store import CONFIG_FIELDS
+from recipe_db import SqliteConfigRepository
+
+REPO_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'ConfigFile.csv')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'recipes.db')
+
+
+def csv_rows(path):
+    with open(path, newline='') as file:
+        return list(csv.reader(file))[1:]
+
+
+def test_repository_csv_is_imported_once(db_path):
+    rows = csv_rows(REPO_CONFIG_FILE)
+    names = list(dict.fromkeys(row[0] for row in rows))
+    db = SqliteConfigRepository(db_path, import_csv=REPO_CONFIG_FILE)
+    assert db.names() == names
+    assert db.get(rows[0][0]) == rows[0]
+    db.close()
+
+    db = SqliteConfigRepository(db_path, import_csv=REPO_CONFIG_FILE)
+    assert db.import_csv(REPO_CONFIG_FILE) == 0
+    assert db.names() == names
+    db.close()
+
+
+def test_duplicate_names_keep_the_first_row(db_path, tmp_path):
+    path = tmp_path / 'ConfigFile.csv'
+    path.write_text('\n'.join(','.join(row) for row in [
+        CONFIG_FIELDS,
+        ['config5', '5', '120', '37', '56'],
+        ['config5', '9', '999', '99', '99'],
+        ['short', '1'],
+    ]) + '\n')
+    db = SqliteConfigRepository(db_path, import_csv=str(path))
+    assert db.names() == ['config5']
+    assert db.get('config5') == ['config5', '5', '120', '37', '56']
+
+
+def test_add_and_delete(db_path):
+    db = SqliteConfigRepository(db_path, import_csv=None)
+    db.add(['config1', '5', '120', '37', '56'])
+    with pytest.raises(ValueError):
+        db.add(['config1', '1', '2', '3', '4'])
+    assert 'config1' in db
+    assert len(db) == 1
+    assert db.delete('config1')
+    assert not db.delete('config1')
+    assert db.get('config1') is None
+
+
+def test_runs_are_listed_newest_first(db_path):
+    db = SqliteConfigRepository(db_path, import_csv=None)
+    db.add_run('config1', '2026-01-01T10:00:00', samples=10, log_path='runs/a.bin')
+    db.add_run('config2', '2026-01-01T11:00:00', samples=20)
+    db.add_run('config1', '2026-01-01T12:00:00', samples=30, video_path='recordings/c.avi')
+    assert [run[2] for run in db.runs()] == ['2026-01-01T12:00:00', '2026-01-01T11:00:00',
+                                             '2026-01-01T10:00:00']
+    assert [run[4] for run in db.runs('config1')] == [30, 10]
+    assert len(db.runs(limit=1)) == 1
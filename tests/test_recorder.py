@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+
+import recorder
+from recorder import VideoRecorder
+
+
+class SlowWriter:
+    """Stands in for cv2.VideoWriter; every frame takes 20 ms to encode."""
+
+    def __init__(self, path, fourcc, fps, size, color):
+        self.frames = 0
+        self.released = False
+
+    def write(self, frame):
+        time.sleep(0.02)
+        self.frames += 1
+
+    def release(self):
+        self.released = True
+
+
+def test_stop_returns_before_the_queued_frames_are_encoded(tmp_path, monkeypatch):
+    monkeypatch.setattr(recorder.cv2, 'VideoWriter', SlowWriter)
+    video = VideoRecorder(str(tmp_path / 'run.avi'), queue_size=20)
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    for i in range(20):
+        video.submit(frame, i)
+    video.start()
+    start = time.perf_counter()
+    video.stop()
+    assert time.perf_counter() - start < 0.1
+    assert video.wait(5)
+    assert video.written + video.dropped == 20
+    lines = (tmp_path / 'run_frames.csv').read_text().splitlines()
+    assert lines[0] == 'frame,timestamp_ns'
+    assert len(lines) == video.written + 1
+
+
+def test_frames_beyond_the_queue_drop_the_oldest(tmp_path):
+    video = VideoRecorder(str(tmp_path / 'run.avi'), queue_size=2)
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    for i in range(5):
+        video.submit(frame, i)
+    assert video.dropped == 3
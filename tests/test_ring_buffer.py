@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from ring_buffer import RingBuffer
+
+
+def test_window_returns_newest_samples_in_order_after_wrapping():
+    buffer = RingBuffer(4)
+    for value in range(10):
+        buffer.append(value)
+    assert len(buffer) == 4
+    assert buffer.total == 10
+    assert buffer.window().tolist() == [6, 7, 8, 9]
+    assert buffer.window(2).tolist() == [8, 9]
+    assert buffer.window(100).tolist() == [6, 7, 8, 9]
+    assert buffer.last() == 9
+
+
+def test_window_is_a_read_only_view():
+    buffer = RingBuffer(4)
+    buffer.extend([1, 2, 3])
+    view = buffer.window()
+    assert np.shares_memory(view, buffer._data)
+    with pytest.raises(ValueError):
+        view[0] = 5
+
+
+def test_extend_across_the_wrap_matches_append():
+    extended = RingBuffer(5)
+    appended = RingBuffer(5)
+    for chunk in ([1, 2, 3], [4, 5, 6, 7], [], [8]):
+        extended.extend(chunk)
+        for value in chunk:
+            appended.append(value)
+        assert extended.window().tolist() == appended.window().tolist()
+        assert extended.total == appended.total
+
+
+def test_extend_longer_than_capacity_keeps_the_tail():
+    buffer = RingBuffer(3)
+    buffer.append(0)
+    buffer.extend(range(1, 11))
+    assert buffer.window().tolist() == [8, 9, 10]
+    assert buffer.total == 11
+
+
+def test_clear_and_empty_buffer():
+    buffer = RingBuffer(3)
+    buffer.extend([1, 2])
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.window().tolist() == []
+    with pytest.raises(IndexError):
+        buffer.last()
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
@@ -0,0 +1,78 @@
+import os
+import threading
+
+import pytest
+
+from protocol import ForceMsg, TemperatureMsg, ModeMsg
+from run_log import RunLogger, new_run_log_path, read_run_log, MODE_CODES
+
+CONFIG = ['config1', '5', '120', '37', '56']
+
+
+def test_round_trip_carries_the_latest_state_into_every_record(tmp_path):
+    path = str(tmp_path / 'run.bin')
+    logger = RunLogger(path, CONFIG, mode="READY")
+    logger.log_messages([TemperatureMsg(37, 1), ModeMsg("PROCESSING", 2), ForceMsg(1.5, 3)])
+    logger.log_messages([ForceMsg(4.25, 4), ModeMsg("PAUSED", 5)])
+    logger.close()
+
+    header, records = read_run_log(path)
+    assert header['process_config'] == CONFIG
+    assert logger.samples == len(records) == 5
+    assert logger.peak_force == 4.25
+    assert records['t_ns'].tolist() == [1, 2, 3, 4, 5]
+    assert records['force'].tolist() == [0.0, 0.0, 1.5, 4.25, 4.25]
+    assert records['temperature'].tolist() == [37] * 5
+    assert records['mode'].tolist() == [MODE_CODES[mode] for mode in
+                                        ["READY", "PROCESSING", "PROCESSING", "PROCESSING", "PAUSED"]]
+
+
+def test_empty_run_log_reads_back_empty(tmp_path):
+    path = str(tmp_path / 'run.bin')
+    RunLogger(path, CONFIG).close()
+    header, records = read_run_log(path)
+    assert header['process_config'] == CONFIG
+    assert len(records) == 0
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a run log')
+    with pytest.raises(ValueError):
+        read_run_log(str(path))
+
+
+def test_close_while_another_thread_logs_loses_nothing_it_accepted(tmp_path):
+    for trial in range(5):
+        path = str(tmp_path / f'run{trial}.bin')
+        logger = RunLogger(path, CONFIG)
+        started = threading.Event()
+        stop = threading.Event()
+
+        def log():
+            while not stop.is_set():
+                logger.log_messages([ForceMsg(1.0, 1)] * 50)
+                started.set()
+
+        thread = threading.Thread(target=log)
+        thread.start()
+        started.wait()
+        logger.close()
+        stop.set()
+        thread.join()
+        _, records = read_run_log(path)
+        assert len(records) == logger.samples > 0
+        assert not logger._pending
+
+
+def test_run_log_paths_started_in_the_same_second_differ(tmp_path):
+    paths = [new_run_log_path(str(tmp_path)) for _ in range(3)]
+    assert len(set(paths)) == 3
+    assert all(os.path.exists(path) for path in paths)
+
+
+def test_run_log_path_carries_the_session_name(tmp_path):
+    first = new_run_log_path(str(tmp_path), '/dev/ttyUSB0')
+    second = new_run_log_path(str(tmp_path), '/dev/ttyUSB1')
+    assert 'ttyUSB0' in os.path.basename(first)
+    assert 'ttyUSB1' in os.path.basename(second)
@@ -0,0 +1,69 @@
+import time
+
+from serial_capture import SerialCapture, ReplayPort, read_capture, replay_speed, MAGIC, RECORD
+
+
+def test_capture_round_trip(tmp_path):
+    path = str(tmp_path / 'session.cap')
+    capture = SerialCapture(path, port='/dev/ttyUSB0')
+    capture.write(b'*PRS:RED#', 1_000)
+    capture.write(b'*FRC:00', 2_000)
+    capture.write(b'0100#', 3_000)
+    capture.close()
+    header, chunks = read_capture(path)
+    assert header['port'] == '/dev/ttyUSB0'
+    assert chunks == [(1_000, b'*PRS:RED#'), (2_000, b'*FRC:00'), (3_000, b'0100#')]
+    assert capture.bytes == 21
+
+
+def test_truncated_record_and_raw_files(tmp_path):
+    path = tmp_path / 'session.cap'
+    capture = SerialCapture(str(path))
+    capture.write(b'*TEP:037#', 1)
+    capture.close()
+    # A crash mid-record leaves a header that promises more bytes than follow
+    path.write_bytes(path.read_bytes() + RECORD.pack(2, 100) + b'*FRC')
+    assert read_capture(str(path))[1] == [(1, b'*TEP:037#')]
+
+    raw = tmp_path / 'dump.bin'
+    raw.write_bytes(b'*TEP:037#*FRC:000100#')
+    assert read_capture(str(raw)) == ({}, [(0, b'*TEP:037#*FRC:000100#')])
+    assert not raw.read_bytes().startswith(MAGIC)
+
+
+def test_replay_releases_chunks_at_their_recorded_pace():
+    port = ReplayPort([(0, b'a'), (50_000_000, b'b'), (100_000_000, b'c')], speed=2.0, timeout=0.5)
+    start = time.perf_counter()
+    received = []
+    while not port.exhausted:
+        received.append((port.read(10), time.perf_counter() - start))
+    assert [chunk for chunk, _ in received] == [b'a', b'b', b'c']
+    # 50 ms apart at 2x speed
+    assert 0.024 <= received[1][1] < 0.2
+    assert 0.049 <= received[2][1] < 0.3
+
+
+def test_max_speed_and_start_on_write():
+    port = ReplayPort([(0, b'*TEP:'), (10**9, b'037#')], speed=0, timeout=0.01, start_on_write=True)
+    assert port.in_waiting == 0
+    assert port.read(100) == b''
+    port.write(b'*1:1:005:120:037:056#')
+    assert port.read(100) == b'*TEP:037#'
+    assert port.written == [b'*1:1:005:120:037:056#']
+
+
+def test_cancel_read_returns_at_once():
+    port = ReplayPort([(0, b'a')], start_on_write=True, timeout=5)
+    port.cancel_read()
+    start = time.perf_counter()
+    assert port.read() == b''
+    assert time.perf_counter() - start < 0.5
+
+
+def test_replay_speed_setting():
+    assert replay_speed(None) == 1.0
+    assert replay_speed("4") == 4.0
+    assert replay_speed("0") == 0.0
+    assert replay_speed("max") == 0.0
+    for bad in ("-2", "fast", "nan", "inf"):
+        assert replay_speed(bad) == 1.0
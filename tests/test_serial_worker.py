@@ -0,0 +1,23 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from serial_worker import SerialWorker
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class IdlePort:
+    in_waiting = 0
+
+    def read(self, size=1):
+        return b''
+
+
+def test_stop_right_after_start_ends_the_thread():
+    worker = SerialWorker(IdlePort())
+    worker.start()
+    worker.stop()
+    assert worker.isFinished()
@@ -0,0 +1,68 @@
+"""Load a Qt Designer .ui file through a cached, precompiled Python module.
+
+uic.loadUi parses the XML and builds every widget through reflection on each
+start. load_ui compiles the file once with uic.compileUi into UI_CACHE_DIR,
+keyed by a hash of the .ui contents, together with its .pyc, and afterwards
+only imports the generated module. If the cache cannot be written, e.g. in a
+read-only install, it falls back to uic.loadUi.
+
+    python ui_loader.py ui_cttm.ui      # precompile, e.g. before a PyInstaller build
+"""
+import hashlib
+import importlib.util
+import io
+import os
+import py_compile
+import sys
+
+from PyQt5 import uic
+
+UI_CACHE_DIR = "__uicache__"
+
+
+def compiled_ui_path(ui_path, cache_dir=UI_CACHE_DIR):
+    with open(ui_path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(ui_path))[0]
+    return os.path.join(cache_dir, f"{name}_{digest}.py")
+
+
+def compile_ui(ui_path, cache_dir=UI_CACHE_DIR):
+    """Compile ui_path into the cache unless it is already there; returns the module path."""
+    path = compiled_ui_path(ui_path, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        source = io.StringIO()
+        uic.compileUi(ui_path, source)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(source.getvalue())
+        os.replace(tmp_path, path)
+        # Write the .pyc now; imports may run with bytecode writing disabled
+        py_compile.compile(path, doraise=True)
+    return path
+
+
+def load_ui(ui_path, widget, cache_dir=UI_CACHE_DIR):
+    """Equivalent of uic.loadUi(ui_path, widget); returns True if the cached module was used."""
+    try:
+        path = compile_ui(ui_path, cache_dir)
+        spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (OSError, SyntaxError, ImportError, py_compile.PyCompileError) as e:
+        print(f"UI cache unavailable ({e}), loading {ui_path} directly")
+        uic.loadUi(ui_path, widget)
+        return False
+    ui_class = next(value for name, value in vars(module).items() if name.startswith('Ui_'))
+    ui = ui_class()
+    ui.setupUi(widget)
+    # loadUi puts the named widgets on the window itself; do the same
+    for name, value in vars(ui).items():
+        setattr(widget, name, value)
+    return True
+
+
+if __name__ == '__main__':
+    for ui_path in sys.argv[1:] or ['ui_cttm.ui']:
+        print(compile_ui(ui_path))